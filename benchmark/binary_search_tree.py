@@ -0,0 +1,60 @@
+"""Measure throughput of the binary search trees on random and sorted key streams.
+
+Usage: python -m benchmark.binary_search_tree
+"""
+
+import random
+import time
+
+from interview.data_structure.binary_search_tree import (
+    AVLTree,
+    BinarySearchTree,
+    CompactBinarySearchTree,
+)
+
+
+def throughput(operation, keys):
+    """Measure operations per second.
+
+    :param callable operation: operation, called with each key.
+    :param list keys: keys.
+    :return: (*float*) -- number of operations per second.
+    """
+    start = time.perf_counter()
+    for k in keys:
+        operation(k)
+    return len(keys) / (time.perf_counter() - start)
+
+
+def main(n=10**6, n_unbalanced_sorted=10**4):
+    """Insert, look up and delete keys. Sorted keys degrade the unbalanced tree to a
+    linked list with quadratic insertion time, fewer keys are used in that case.
+
+    :param int n: number of keys.
+    :param int n_unbalanced_sorted: number of sorted keys for the unbalanced tree.
+    """
+    print(
+        f"{'tree':>23} {'keys':>6} {'N':>8} {'insert/s':>9} {'exist/s':>9} "
+        f"{'delete/s':>9}"
+    )
+    for stream in ("random", "sorted"):
+        for tree_type in (BinarySearchTree, AVLTree, CompactBinarySearchTree):
+            size = n
+            if stream == "sorted" and tree_type is BinarySearchTree:
+                size = min(n, n_unbalanced_sorted)
+            keys = list(range(size))
+            if stream == "random":
+                random.Random(0).shuffle(keys)
+
+            tree = tree_type()
+            insert = throughput(tree.insert, keys)
+            exist = throughput(tree.exist, keys)
+            delete = throughput(tree.delete, keys)
+            print(
+                f"{tree_type.__name__:>23} {stream:>6} {size:>8} {insert:9.0f} "
+                f"{exist:9.0f} {delete:9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
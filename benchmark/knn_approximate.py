@@ -0,0 +1,70 @@
+"""Compare recall and throughput of the approximate nearest neighbors search of KNN
+against the exact brute force search.
+
+Usage: python -m benchmark.knn_approximate
+"""
+
+import time
+
+import numpy as np
+
+from interview.algorithm.knn import KNNRegressor
+
+
+def embeddings(n, d, n_latent, rng):
+    """Generate examples mimicking embeddings: high dimensional features lying close
+    to a low dimensional subspace.
+
+    :param int n: number of examples.
+    :param int d: number of features.
+    :param int n_latent: dimension of the subspace.
+    :param numpy.random.Generator rng: random number generator.
+    :return: (*numpy.ndarray*) -- examples.
+    """
+    latent = rng.standard_normal((n, n_latent)) @ rng.standard_normal((n_latent, d))
+    return latent + 0.1 * rng.standard_normal((n, d))
+
+
+def throughput(model, x_test):
+    """Measure query throughput.
+
+    :param KNN model: fitted model.
+    :param numpy.ndarray x_test: test examples.
+    :return: (*tuple*) -- neighbors and number of queries per second.
+    """
+    start = time.perf_counter()
+    neighbors = model.kneighbors(x_test)
+    return neighbors, len(x_test) / (time.perf_counter() - start)
+
+
+def main(n=10**5, d=64, k=10, n_test=1000):
+    rng = np.random.default_rng(0)
+    x_train = embeddings(n + n_test, d, 8, rng)
+    x_train, x_test = x_train[:n], x_train[n:]
+    y_train = rng.random(n)
+
+    exact = KNNRegressor(k)
+    exact.fit(x_train, y_train)
+    truth, reference = throughput(exact, x_test)
+    print(f"N={n} d={d} k={k}, brute force: {reference:.0f} queries/s")
+
+    print(f"{'n_trees':>7} {'n_candidates':>12} {'recall':>6} {'queries/s':>9}")
+    for n_trees in (5, 10, 20):
+        for n_candidates in (100, 400, 1600):
+            model = KNNRegressor(
+                k,
+                algorithm="rp_forest",
+                n_trees=n_trees,
+                n_candidates=n_candidates,
+                random_state=0,
+            )
+            model.fit(x_train, y_train)
+            neighbors, speed = throughput(model, x_test)
+            recall = np.mean(
+                [len(np.intersect1d(a, t)) / k for a, t in zip(neighbors, truth)]
+            )
+            print(f"{n_trees:>7} {n_candidates:>12} {recall:>6.3f} {speed:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Compare query latency of the nearest neighbors search algorithms of KNN.
+
+Usage: python -m benchmark.knn_index
+"""
+
+import time
+
+import numpy as np
+
+from interview.algorithm.knn import KNNRegressor
+
+
+def latency(model, x_test):
+    """Measure average query latency.
+
+    :param KNN model: fitted model.
+    :param numpy.ndarray x_test: test examples.
+    :return: (*float*) -- average latency in microseconds per test example.
+    """
+    start = time.perf_counter()
+    model.kneighbors(x_test)
+    return 1e6 * (time.perf_counter() - start) / len(x_test)
+
+
+def main(sizes=(10**3, 10**4, 10**5, 10**6), dimensions=(2, 3, 8, 32), k=5):
+    rng = np.random.default_rng(0)
+    print(f"{'N':>8} {'d':>3} {'algorithm':>10} {'fit (s)':>8} {'query (us)':>11}")
+    for n in sizes:
+        for d in dimensions:
+            x_train = rng.random((n, d))
+            y_train = rng.random(n)
+            x_test = rng.random((200, d))
+            for algorithm in ("brute", "kd_tree", "ball_tree"):
+                model = KNNRegressor(k, algorithm=algorithm)
+                start = time.perf_counter()
+                model.fit(x_train, y_train)
+                fit = time.perf_counter() - start
+                print(
+                    f"{n:>8} {d:>3} {algorithm:>10} {fit:>8.2f} "
+                    f"{latency(model, x_test):>11.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Compare memory per element and garbage collection pauses of the linked lists.
+
+Usage: python -m benchmark.singly_linked_list
+"""
+
+import gc
+import time
+import tracemalloc
+
+from interview.data_structure.singly_linked_list import (
+    PooledLinkedList,
+    SinglyLinkedList,
+    UnrolledLinkedList,
+)
+
+
+def memory(factory, n):
+    """Measure memory allocated by a linked list of integers.
+
+    :param callable factory: function creating an empty linked list.
+    :param int n: number of elements.
+    :return: (*tuple*) -- linked list and number of bytes per element.
+    """
+    tracemalloc.start()
+    linked_list = factory()
+    linked_list.create(range(n))
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return linked_list, size / n
+
+
+def pause(repeat=3):
+    """Measure duration of a full garbage collection.
+
+    :param int repeat: number of collections, the fastest is kept.
+    :return: (*float*) -- time in seconds.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        gc.collect()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main(n=10**6):
+    lists = {
+        "SinglyLinkedList": SinglyLinkedList,
+        "UnrolledLinkedList": UnrolledLinkedList,
+        "PooledLinkedList": PooledLinkedList,
+        "PooledLinkedList('q')": lambda: PooledLinkedList("q"),
+    }
+    print(f"N={n}, empty heap gc pause: {1000 * pause():.1f} ms")
+    print(f"{'linked list':>21} {'bytes/element':>13} {'gc pause (ms)':>13}")
+    for name, factory in lists.items():
+        linked_list, size = memory(factory, n)
+        print(f"{name:>21} {size:13.1f} {1000 * pause():13.1f}")
+        del linked_list
+
+
+if __name__ == "__main__":
+    main()
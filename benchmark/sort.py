@@ -0,0 +1,71 @@
+"""Compare the sorting functions on lists, NumPy arrays and ``array.array`` over
+sizes and key distributions.
+
+Usage: python -m benchmark.sort
+"""
+
+import time
+from array import array
+
+import numpy as np
+
+from interview.algorithm.sort import bubblesort, numeric_sort, quicksort
+
+
+def keys(distribution, n, rng):
+    """Generate keys.
+
+    :param str distribution: *uniform* integers, integers in a *small* range,
+        *sorted* integers or *normal* floats.
+    :param int n: number of keys.
+    :param numpy.random.Generator rng: random number generator.
+    :return: (*numpy.ndarray*) -- keys.
+    """
+    if distribution == "uniform":
+        return rng.integers(-(2**62), 2**62, n)
+    elif distribution == "small":
+        return rng.integers(0, 256, n)
+    elif distribution == "sorted":
+        return np.arange(n)
+    else:
+        return rng.standard_normal(n)
+
+
+def elapsed(sort, data):
+    """Measure sorting time.
+
+    :param callable sort: sorting function, called with data.
+    :param object data: data to sort.
+    :return: (*float*) -- time in seconds.
+    """
+    start = time.perf_counter()
+    sort(data)
+    return time.perf_counter() - start
+
+
+def main(sizes=(10**3, 10**5, 10**6), bubble_limit=10**3):
+    rng = np.random.default_rng(0)
+    print(
+        f"{'distribution':>12} {'N':>8} {'bubblesort':>10} {'quicksort':>10} "
+        f"{'numpy':>10} {'array':>10} {'np.sort':>10}"
+    )
+    for distribution in ("uniform", "small", "sorted", "normal"):
+        for n in sizes:
+            data = keys(distribution, n, rng)
+            typecode = "d" if data.dtype.kind == "f" else "q"
+            bubble = (
+                f"{elapsed(bubblesort, data.tolist()):10.4f}"
+                if n <= bubble_limit
+                else f"{'-':>10}"
+            )
+            print(
+                f"{distribution:>12} {n:>8} {bubble} "
+                f"{elapsed(quicksort, data.tolist()):10.4f} "
+                f"{elapsed(numeric_sort, data.copy()):10.4f} "
+                f"{elapsed(numeric_sort, array(typecode, data.tolist())):10.4f} "
+                f"{elapsed(np.sort, data):10.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
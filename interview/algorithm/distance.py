@@ -0,0 +1,142 @@
+import numpy as np
+
+metrics = ("euclidean", "sqeuclidean", "manhattan", "chebyshev", "minkowski", "cosine")
+
+
+def check_metric(metric, p=2):
+    """Check metric.
+
+    :param str metric: name of the metric.
+    :param float p: power of the minkowski metric.
+    :raises ValueError: if ``metric`` is unknown or ``p`` is lower than 1.
+    """
+    if metric not in metrics:
+        raise ValueError("metric must be one of: " + ", ".join(metrics))
+    if metric == "minkowski" and p < 1:
+        raise ValueError("p must be greater or equal to 1")
+
+
+def reduced_norm(v, metric="euclidean", p=2):
+    """Calculate reduced norm of vectors along the last axis. The reduced norm is a
+    monotonic transformation of the norm that is cheaper to calculate, e.g. the
+    euclidean norm is not square rooted. It is enough to rank distances.
+
+    :param numpy.ndarray v: vectors.
+    :param str metric: name of the metric, cosine excluded.
+    :param float p: power of the minkowski metric.
+    :return: (*numpy.ndarray*) -- reduced norms.
+    """
+    if metric in {"euclidean", "sqeuclidean"}:
+        return np.einsum("...i,...i->...", v, v)
+    elif metric == "manhattan":
+        return np.abs(v).sum(axis=-1)
+    elif metric == "chebyshev":
+        return np.abs(v).max(axis=-1)
+    else:
+        return np.power(np.abs(v), p).sum(axis=-1)
+
+
+def reduced_distance(a, b, metric="euclidean", p=2, sq_norm=None):
+    """Calculate reduced distances between two blocks of points. The memory used is
+    of the order of the distance matrix.
+
+    :param numpy.ndarray a: first block of points, array of shape (n_a, n_features).
+    :param numpy.ndarray b: second block of points, array of shape (n_b, n_features).
+    :param str metric: name of the metric.
+    :param float p: power of the minkowski metric.
+    :param numpy.ndarray sq_norm: squared euclidean norms of the points in ``b``. Used
+        by the euclidean, squared euclidean and cosine metrics. Calculated if not
+        given.
+    :return: (*numpy.ndarray*) -- array of shape (n_a, n_b) giving reduced distances.
+    """
+    if metric in {"euclidean", "sqeuclidean", "cosine"}:
+        sq_norm = np.einsum("ij,ij->i", b, b) if sq_norm is None else sq_norm
+        dot = a @ b.T
+        if metric == "cosine":
+            norm = np.sqrt(np.einsum("ij,ij->i", a, a))[:, None] * np.sqrt(sq_norm)
+            return 1 - np.divide(dot, norm, out=np.zeros_like(dot), where=norm > 0)
+        distance = np.einsum("ij,ij->i", a, a)[:, None] - 2 * dot + sq_norm[None, :]
+        return np.maximum(distance, 0, out=distance)
+
+    # Accumulate over features so that no (n_a, n_b, n_features) array is created
+    distance = np.zeros((len(a), len(b)))
+    for i in range(a.shape[1]):
+        gap = np.abs(a[:, i, None] - b[None, :, i])
+        if metric == "manhattan":
+            distance += gap
+        elif metric == "chebyshev":
+            np.maximum(distance, gap, out=distance)
+        else:
+            distance += np.power(gap, p)
+    return distance
+
+
+def candidate_distance(x, candidate, metric="euclidean", p=2, sq_norm=None):
+    """Calculate reduced distances between points and their own candidates.
+
+    :param numpy.ndarray x: points, array of shape (n, n_features).
+    :param numpy.ndarray candidate: candidates of each point, array of shape (n,
+        n_candidates, n_features).
+    :param str metric: name of the metric.
+    :param float p: power of the minkowski metric.
+    :param numpy.ndarray sq_norm: squared euclidean norms of the candidates, array of
+        shape (n, n_candidates). Used by the euclidean, squared euclidean and cosine
+        metrics. Calculated if not given.
+    :return: (*numpy.ndarray*) -- array of shape (n, n_candidates) giving reduced
+        distances.
+    """
+    if metric in {"euclidean", "sqeuclidean", "cosine"}:
+        sq_norm = reduced_norm(candidate) if sq_norm is None else sq_norm
+        dot = np.einsum("ijk,ik->ij", candidate, x)
+        if metric == "cosine":
+            norm = np.sqrt(reduced_norm(x))[:, None] * np.sqrt(sq_norm)
+            return 1 - np.divide(dot, norm, out=np.zeros_like(dot), where=norm > 0)
+        distance = reduced_norm(x)[:, None] - 2 * dot + sq_norm
+        return np.maximum(distance, 0, out=distance)
+    return reduced_norm(candidate - x[:, None, :], metric, p)
+
+
+def to_distance(reduced, metric="euclidean", p=2):
+    """Convert reduced distances to distances.
+
+    :param numpy.ndarray reduced: reduced distances.
+    :param str metric: name of the metric.
+    :param float p: power of the minkowski metric.
+    :return: (*numpy.ndarray*) -- distances.
+    """
+    if metric == "euclidean":
+        return np.sqrt(reduced)
+    elif metric == "minkowski":
+        return np.power(reduced, 1 / p)
+    else:
+        return reduced
+
+
+def from_distance(distance, metric="euclidean", p=2):
+    """Convert distances to reduced distances.
+
+    :param numpy.ndarray distance: distances.
+    :param str metric: name of the metric.
+    :param float p: power of the minkowski metric.
+    :return: (*numpy.ndarray*) -- reduced distances.
+    """
+    if metric == "euclidean":
+        return np.square(distance)
+    elif metric == "minkowski":
+        return np.power(distance, p)
+    else:
+        return distance
+
+
+def pairwise_distance(a, b, metric="euclidean", p=2):
+    """Calculate distances between two blocks of points.
+
+    :param numpy.ndarray a: first block of points, array of shape (n_a, n_features).
+    :param numpy.ndarray b: second block of points, array of shape (n_b, n_features).
+    :param str metric: name of the metric.
+    :param float p: power of the minkowski metric.
+    :return: (*numpy.ndarray*) -- array of shape (n_a, n_b) giving distances.
+    """
+    check_metric(metric, p)
+    a, b = np.atleast_2d(a), np.atleast_2d(b)
+    return to_distance(reduced_distance(a, b, metric, p), metric, p)
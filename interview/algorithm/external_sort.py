@@ -0,0 +1,165 @@
+import heapq
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from interview.algorithm.sort import numeric_sort
+
+
+def external_sort(
+    input_path,
+    output_path,
+    dtype,
+    order=None,
+    chunk_size=2**27,
+    n_jobs=1,
+    tmp_dir=None,
+    buffer_size=2**24,
+):
+    """Sort binary file of fixed width records that does not fit in memory. Stable:
+    records with equal keys keep their relative order.
+
+    The input file is memory mapped and cut in chunks. Each chunk is sorted in memory
+    by a worker of a process pool and spilled to a temporary file, called a run. Runs
+    are then merged: blocks of each run are read, and all buffered records lower or
+    equal to the smallest last record of the blocks, ordered by key then run and
+    taken from a heap, are sorted and written at once. The run whose block ends with
+    that record is read further. Keys must not be NaN.
+
+    :param str input_path: path to input file.
+    :param str output_path: path to output file.
+    :param numpy.dtype dtype: data type of the records, e.g. ``"<i8"`` or a
+        structured data type.
+    :param str order: name of the field used as key for structured records.
+    :param int chunk_size: number of bytes sorted in memory at once by a worker.
+    :param int n_jobs: number of processes sorting chunks in parallel, -1 to use all
+        processors.
+    :param str tmp_dir: directory where runs are spilled, the default temporary
+        directory if None.
+    :param int buffer_size: number of bytes read from the runs and written to the
+        output file at once when merging.
+    :return: (*float*) -- throughput in MB/s.
+    :raises ValueError: if records are structured and ``order`` is not given, or if
+        the size of the input file is not a multiple of the size of a record.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.names is not None and order is None:
+        raise ValueError("order must be given for structured records")
+    size = os.path.getsize(input_path)
+    if size % dtype.itemsize != 0:
+        raise ValueError("file size must be a multiple of the record size")
+
+    start = time.perf_counter()
+    n = size // dtype.itemsize
+    step = max(1, chunk_size // dtype.itemsize)
+    chunks = [(i, min(i + step, n)) for i in range(0, n, step)]
+    workers = (os.cpu_count() or 1) if n_jobs == -1 else max(1, n_jobs)
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as directory:
+        runs = [os.path.join(directory, f"run_{i}.bin") for i in range(len(chunks))]
+        tasks = [
+            (input_path, dtype, first, last, order, run)
+            for (first, last), run in zip(chunks, runs)
+        ]
+        if workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                sort_run(*task)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(sort_run, *zip(*tasks)))
+
+        if len(runs) == 1:
+            shutil.move(runs[0], output_path)
+        else:
+            merge_runs(runs, output_path, dtype, order, buffer_size)
+
+    return size / 2**20 / (time.perf_counter() - start)
+
+
+def sort_run(input_path, dtype, first, last, order, run_path):
+    """Sort chunk of the input file in memory and write it to a run file.
+
+    :param str input_path: path to input file.
+    :param numpy.dtype dtype: data type of the records.
+    :param int first: index of the first record of the chunk.
+    :param int last: index of the record following the chunk.
+    :param str order: name of the field used as key for structured records.
+    :param str run_path: path to run file.
+    """
+    records = np.memmap(input_path, dtype=dtype, mode="r")[first:last]
+    sort_records(np.array(records), order).tofile(run_path)
+
+
+def sort_records(records, order=None):
+    """Sort records by key. Stable.
+
+    :param numpy.ndarray records: records.
+    :param str order: name of the field used as key for structured records.
+    :return: (*numpy.ndarray*) -- sorted records, sorted inplace for numbers in native
+        byte order.
+    """
+    if order is None and records.dtype.isnative:
+        numeric_sort(records)
+        return records
+    key = records if order is None else records[order]
+    return records[np.argsort(key, kind="stable")]
+
+
+def merge_runs(runs, output_path, dtype, order=None, buffer_size=2**24):
+    """Merge sorted run files. Stable: on ties, records of earlier runs come first.
+
+    :param list runs: paths to run files.
+    :param str output_path: path to output file.
+    :param numpy.dtype dtype: data type of the records.
+    :param str order: name of the field used as key for structured records.
+    :param int buffer_size: number of bytes read from the runs and written to the
+        output file at once.
+    """
+    block = max(1, buffer_size // (len(runs) + 1) // dtype.itemsize)
+    files = [open(run, "rb") for run in runs]
+    try:
+        buffers = [np.fromfile(f, dtype=dtype, count=block) for f in files]
+        position = [0] * len(runs)
+        heap = [(last_key(b, order), i) for i, b in enumerate(buffers) if len(b) > 0]
+        heapq.heapify(heap)
+
+        with open(output_path, "wb", buffering=buffer_size) as output:
+            while heap:
+                # Records are ordered by key then run, take all lower than the bound
+                bound, top = heap[0]
+                parts = []
+                for i, b in enumerate(buffers):
+                    key = b[position[i] :] if order is None else b[order][position[i] :]
+                    side = "right" if i <= top else "left"
+                    count = int(np.searchsorted(key, bound, side=side))
+                    parts.append(b[position[i] : position[i] + count])
+                    position[i] += count
+                # Timsort merges the sorted parts in O(Nlog(k))
+                batch = np.concatenate(parts, dtype=dtype)
+                key = batch if order is None else batch[order]
+                batch[np.argsort(key, kind="stable")].tofile(output)
+
+                # The block ending with the bound is exhausted, read next block
+                while heap and position[heap[0][1]] == len(buffers[heap[0][1]]):
+                    _, i = heapq.heappop(heap)
+                    buffers[i] = np.fromfile(files[i], dtype=dtype, count=block)
+                    position[i] = 0
+                    if len(buffers[i]) > 0:
+                        heapq.heappush(heap, (last_key(buffers[i], order), i))
+    finally:
+        for f in files:
+            f.close()
+
+
+def last_key(records, order=None):
+    """Get key of the last record.
+
+    :param numpy.ndarray records: records.
+    :param str order: name of the field used as key for structured records.
+    :return: (*object*) -- key.
+    """
+    return records[-1] if order is None else records[-1][order]
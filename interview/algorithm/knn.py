@@ -1,7 +1,13 @@
+import os
+import time
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
+from interview.algorithm.distance import check_metric, from_distance, reduced_distance
+from interview.algorithm.spatial_index import BallTree, KDTree, RandomProjectionForest
+
 
 class KNN:
     """The k-nearest neighbors algorithm is a non-parametric, supervised learning
@@ -9,20 +15,330 @@ class KNN:
     the input consists of the k closest training examples in a data set.
 
     :param int k: number of neighbor to consider for classification/regression.
+    :param str algorithm: algorithm used to find the nearest neighbors. Either
+        *'brute'*, *'kd_tree'*, *'ball_tree'*, *'rp_forest'* or *'auto'*. Spatial
+        indexes are built when the model is fitted. With *'auto'*, a k-d tree is used
+        for large training datasets with few features held in memory and brute force
+        otherwise. The
+        random projection forest, *'rp_forest'*, is an approximate search: neighbors
+        are only looked for among a subset of candidates.
+    :param int leaf_size: maximum number of training examples in a leaf of the
+        k-d tree or ball tree.
+    :param int n_trees: number of trees of the random projection forest.
+    :param int n_candidates: number of candidates per test example for the random
+        projection forest. Each tree contributes the training examples of the leaf
+        reached by the test example.
+    :param int random_state: seed of the random projection forest.
+    :param str metric: metric used to rank training examples. Either *'euclidean'*,
+        *'sqeuclidean'*, *'manhattan'*, *'chebyshev'*, *'minkowski'*, *'cosine'* or
+        *'precomputed'*. Distances are ranked using reduced distances, e.g. no square
+        root is taken for the euclidean metric. With *'precomputed'*, the training
+        dataset is the square matrix of distances between training examples and test
+        examples are given by their distances to the training examples. The k-d tree
+        and ball tree do not support the cosine metric and precomputed distances can
+        only be searched by brute force.
+    :param float p: power of the minkowski metric.
+    :param int memory_budget: maximum number of bytes used by the distance matrix
+        between a block of test examples and the training dataset. Test examples are
+        processed in blocks fitting in this budget.
+    :param int chunk_size: number of training examples read at once by the brute
+        force search. By default, the whole training dataset when it is held in
+        memory, and as many training examples as fit in a quarter of the memory budget
+        when it is memory-mapped.
+    :param int n_jobs: number of threads searching neighbors in parallel, -1 to use
+        all processors. Test examples are sharded across a thread pool and results are
+        gathered in order. Threads share the training dataset and the spatial index
+        without copy. The brute force search and the random projection forest run
+        NumPy kernels on whole blocks, which release the GIL, and scale with threads.
+        The k-d tree and ball tree search each test example in a Python loop holding
+        the GIL, only their brute force search of recently added training examples
+        runs in parallel.
+    :param int max_size: maximum number of training examples. When exceeded, the
+        oldest training examples are evicted.
+    :param float window: maximum age of the training examples, in the unit of the
+        timestamps given to :meth:`partial_fit`. Older training examples are evicted.
+    :raises ValueError: if ``algorithm`` or ``metric`` is unknown or if they are not
+        compatible.
     """
 
-    def __init__(self, k):
+    indexes = {
+        "kd_tree": KDTree,
+        "ball_tree": BallTree,
+        "rp_forest": RandomProjectionForest,
+    }
+
+    def __init__(
+        self,
+        k,
+        algorithm="brute",
+        leaf_size=30,
+        n_trees=10,
+        n_candidates=200,
+        random_state=None,
+        metric="euclidean",
+        p=2,
+        memory_budget=2**26,
+        chunk_size=None,
+        n_jobs=1,
+        max_size=None,
+        window=None,
+    ):
+        if algorithm not in {"brute", "auto", *self.indexes}:
+            raise ValueError(
+                "algorithm must be one of: brute, auto, " + ", ".join(self.indexes)
+            )
+        if metric == "precomputed":
+            if algorithm not in {"brute", "auto"}:
+                raise ValueError("precomputed distances are searched by brute force")
+        else:
+            check_metric(metric, p)
+        if metric == "cosine" and algorithm in {"kd_tree", "ball_tree"}:
+            raise ValueError("cosine metric is not supported by spatial trees")
         self.k = k
+        self.algorithm = algorithm
+        self.leaf_size = leaf_size
+        self.n_trees = n_trees
+        self.n_candidates = n_candidates
+        self.random_state = random_state
+        self.metric = metric
+        self.p = p
+        self.memory_budget = memory_budget
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs
+        self.max_size = max_size
+        self.window = window
+
+    def fit(self, x_train, y_train, dtype=None, n_features=None, y_dtype=None):
+        """Store training dataset and cache the squared norm of the training examples.
+        Build spatial index if requested.
+
+        Training datasets larger than memory can be given as a :class:`numpy.memmap`
+        or as a path to a *.npy* or raw binary file, which is then memory-mapped. The
+        brute force search streams memory-mapped datasets in chunks and the squared
+        norms are calculated on the fly rather than cached. Building a spatial index
+        would read the whole dataset in memory, hence memory-mapped datasets are only
+        searched by brute force.
+
+        With precomputed distances, ``x_train`` is the square matrix of distances
+        between training examples.
+
+        :param list/numpy.memmap/str x_train: training dataset. Each training example
+            has several features.
+        :param list/numpy.memmap/str y_train: outcomes of training dataset.
+        :param str/numpy.dtype dtype: data type of raw binary training dataset.
+        :param int n_features: number of features of raw binary training dataset.
+        :param str/numpy.dtype y_dtype: data type of raw binary outcomes.
+        :raises ValueError: if the training dataset is memory-mapped and a spatial
+            index is requested.
+        """
+        self.x_buffer = self.load(x_train, dtype=dtype, n_features=n_features)
+        if isinstance(self.x_buffer, np.memmap) and self.algorithm in self.indexes:
+            raise ValueError(
+                "memory-mapped training datasets are searched by brute force"
+            )
+        self.y_buffer = self.load(y_train, dtype=y_dtype)
+        self.norm_buffer = (
+            np.einsum("ij,ij->i", self.x_buffer, self.x_buffer)
+            if self.metric in {"euclidean", "sqeuclidean", "cosine"}
+            and not isinstance(self.x_buffer, np.memmap)
+            else None
+        )
+        self.time_buffer = None
+        self.fit_time = time.time()
+        self.offset, self.first, self.last = 0, 0, len(self.y_buffer)
+        self.update_views()
+        self.update_index(rebuild=True)
+
+    def partial_fit(self, x, y, timestamp=None):
+        """Add training examples. Training examples are appended to buffers whose
+        capacity is doubled when full, so that appending costs amortized O(1) per
+        training example. The oldest training examples are then evicted according to
+        ``max_size`` and ``window``. Training examples given to :meth:`fit` are
+        timestamped with the time of the fit.
+
+        The spatial index is not rebuilt on every call: new training examples are
+        searched by brute force until they outnumber the indexed ones, and evicted
+        training examples are skipped by the index search until they make half of the
+        index.
+
+        :param list x: training example(s).
+        :param list/int/float/str y: outcome(s) of training example(s).
+        :param float/list timestamp: timestamp(s) of training example(s), used by the
+            time window. Timestamps must not decrease. Defaults to current time.
+        :raises ValueError: if distances are precomputed.
+        """
+        if self.metric == "precomputed":
+            raise ValueError("precomputed distances cannot be updated")
+        x = np.atleast_2d(np.asarray(x, dtype=float))
+        y = np.atleast_1d(np.asarray(y))
+        timestamp = np.broadcast_to(
+            time.time() if timestamp is None else np.asarray(timestamp, dtype=float),
+            len(y),
+        )
+        if not hasattr(self, "x_buffer"):
+            self.fit(x[:0], y[:0])
+
+        n = self.last - self.first
+        stop = self.last - self.offset + len(y)
+        dtype = np.result_type(self.y_buffer.dtype, y.dtype)
+        if (
+            stop > len(self.x_buffer)
+            or not self.x_buffer.flags.writeable
+            or dtype != self.y_buffer.dtype
+        ):
+            self.grow(max(2 * (n + len(y)), 16), dtype)
+            stop = n + len(y)
+
+        new = slice(stop - len(y), stop)
+        self.x_buffer[new] = x
+        self.y_buffer[new] = y
+        self.time_buffer[new] = timestamp
+        if self.norm_buffer is not None:
+            self.norm_buffer[new] = np.einsum("ij,ij->i", x, x)
+        self.last += len(y)
+
+        if self.max_size is not None:
+            self.first = max(self.first, self.last - self.max_size)
+        if self.window is not None:
+            time_buffer = self.time_buffer[self.first - self.offset : stop]
+            expired = np.searchsorted(time_buffer, time_buffer[-1] - self.window)
+            self.first += int(expired)
+        self.update_views()
+        self.update_index()
+
+    def grow(self, capacity, dtype):
+        """Move active training examples to the beginning of new buffers. Previous
+        buffers are left untouched, the spatial index may still refer to them.
+
+        :param int capacity: number of training examples of new buffers.
+        :param numpy.dtype dtype: data type of outcomes.
+        """
+        start, stop = self.first - self.offset, self.last - self.offset
+        n = stop - start
+        x_buffer = np.empty((capacity,) + self.x_buffer.shape[1:])
+        y_buffer = np.empty(capacity, dtype=dtype)
+        time_buffer = np.empty(capacity)
+        x_buffer[:n] = self.x_buffer[start:stop]
+        y_buffer[:n] = self.y_buffer[start:stop]
+        time_buffer[:n] = (
+            self.fit_time if self.time_buffer is None else self.time_buffer[start:stop]
+        )
+        if self.metric in {"euclidean", "sqeuclidean", "cosine"}:
+            norm_buffer = np.empty(capacity)
+            norm_buffer[:n] = np.einsum("ij,ij->i", x_buffer[:n], x_buffer[:n])
+            self.norm_buffer = norm_buffer
+        self.x_buffer, self.y_buffer, self.time_buffer = x_buffer, y_buffer, time_buffer
+        self.offset = self.first
+
+    def update_views(self):
+        """Expose active training examples, outcomes and squared norms as views of the
+        buffers.
+        """
+        active = slice(self.first - self.offset, self.last - self.offset)
+        self.x_train = self.x_buffer[active]
+        self.y_train = self.y_buffer[active]
+        self.sq_norm = None if self.norm_buffer is None else self.norm_buffer[active]
+
+    def update_index(self, rebuild=False):
+        """Rebuild spatial index when training examples added since the last build
+        outnumber the indexed ones or when more than half of the indexed training
+        examples have been evicted. The cost of building the index is thereby
+        amortized over the training examples added.
+
+        :param bool rebuild: force rebuild.
+        """
+        size = self.index_last - self.index_first if not rebuild else 0
+        added = self.last - max(self.index_last, self.first) if not rebuild else 0
+        evicted = self.first - self.index_first if not rebuild else 0
+        if rebuild or added > size or 2 * evicted > size:
+            self.index = self.build_index() if len(self.x_train) > 0 else None
+            self.index_first, self.index_last = self.first, self.last
+
+    def __getstate__(self):
+        """Get state of the model. Buffers are replaced by the active training
+        examples, outcomes, squared norms and timestamps.
+
+        :return: (*dict*) -- state of the model.
+        """
+        state = dict(self.__dict__)
+        for name in ["x_buffer", "y_buffer", "norm_buffer", "time_buffer"]:
+            state.pop(name, None)
+        if getattr(self, "time_buffer", None) is not None:
+            state["time_train"] = self.time_buffer[
+                self.first - self.offset : self.last - self.offset
+            ]
+        return state
+
+    def __setstate__(self, state):
+        """Restore state of the model. Active training examples, outcomes, squared
+        norms and timestamps are used as buffers.
+
+        :param dict state: state of the model.
+        """
+        self.__dict__.update(state)
+        if "x_train" in state:
+            self.x_buffer, self.y_buffer = self.x_train, self.y_train
+            self.norm_buffer = self.sq_norm
+            self.time_buffer = self.__dict__.pop("time_train", None)
+            self.offset = self.first
+
+    @staticmethod
+    def load(data, dtype=None, n_features=None):
+        """Get array from data. Files are memory-mapped in read-only mode.
+
+        :param list/numpy.memmap/str data: data or path to a *.npy* or raw binary
+            file.
+        :param str/numpy.dtype dtype: data type of raw binary file.
+        :param int n_features: number of columns of raw binary file, None for a 1-D
+            array.
+        :return: (*numpy.ndarray*) -- array, a :class:`numpy.memmap` for files.
+        :raises ValueError: if ``dtype`` is not given for raw binary file.
+        """
+        if isinstance(data, np.memmap):
+            return data
+        elif isinstance(data, (str, os.PathLike)):
+            if str(data).endswith(".npy"):
+                return np.load(data, mmap_mode="r")
+            elif dtype is None:
+                raise ValueError("dtype must be given for raw binary file")
+            shape = None if n_features is None else (-1, n_features)
+            array = np.memmap(data, dtype=dtype, mode="r")
+            return array if shape is None else array.reshape(shape)
+        else:
+            return np.asarray(data)
 
-    def fit(self, x_train, y_train):
-        """Store training dataset.
+    def build_index(self):
+        """Build spatial index of the training dataset.
 
-        :param list x_train: training dataset. Each training example has several
-            features.
-        :param list y_train: outcomes of training dataset.
+        :return: (*object*) -- spatial index, None for brute force.
         """
-        self.x_train = x_train
-        self.y_train = y_train
+        algorithm = self.algorithm
+        if algorithm == "auto":
+            n, d = self.x_train.shape
+            algorithm = (
+                "kd_tree"
+                if d <= 3
+                and n >= 50000
+                and self.metric not in {"cosine", "precomputed"}
+                and not isinstance(self.x_train, np.memmap)
+                else "brute"
+            )
+
+        if algorithm == "brute":
+            return None
+        elif algorithm == "rp_forest":
+            return RandomProjectionForest(
+                self.x_train,
+                n_trees=self.n_trees,
+                leaf_size=max(2 * self.k, -(-self.n_candidates // self.n_trees)),
+                random_state=self.random_state,
+                metric=self.metric,
+                p=self.p,
+            )
+        else:
+            return self.indexes[algorithm](
+                self.x_train, leaf_size=self.leaf_size, metric=self.metric, p=self.p
+            )
 
     def find_neighbors(self, x):
         """Find k-nearest training examples for a test example.
@@ -32,10 +348,153 @@ class KNN:
             enclosing the features of the closest neighbors. Second element in array of
             size k enclosing the outcome of the closest neighbors.
         """
-        distance = [self.euclidean_distance(x, e) for e in self.x_train]
+        id = self.kneighbors([x])[0]
+        return (self.x_train[id], self.y_train[id])
+
+    def kneighbors(self, x_test):
+        """Find k-nearest training examples for each test example. Test examples are
+        split in blocks, searched in parallel if requested. Without spatial index,
+        the size of the blocks is set by the memory budget.
+
+        :param list x_test: test dataset. Each test example has the same number of
+            features than a training example. With precomputed distances, distances
+            between test examples and training examples.
+        :return: (*numpy.ndarray*) -- array of shape (n_test, k) giving the indices of
+            the closest training examples, sorted by increasing distance.
+        """
+        x_test = np.asarray(x_test, dtype=float)
+        n_jobs = self.workers()
+        size = max(1, -(-len(x_test) // n_jobs))
+        if self.index is None:
+            size = min(size, self.block_size())
+            search = self._kneighbors
+        else:
+            search = self._query_index
+        blocks = [x_test[i : i + size] for i in range(0, len(x_test), size)]
+
+        if len(blocks) == 0:
+            return np.empty((0, min(self.k, len(self.x_train))), dtype=np.intp)
+        elif n_jobs == 1 or len(blocks) == 1:
+            return np.vstack([search(b) for b in blocks])
+        else:
+            with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+                return np.vstack(list(pool.map(search, blocks)))
+
+    def workers(self):
+        """Get number of threads searching neighbors.
+
+        :return: (*int*) -- number of threads.
+        """
+        if self.n_jobs == -1:
+            return os.cpu_count() or 1
+        return max(1, self.n_jobs)
+
+    def block_size(self):
+        """Calculate number of test examples processed at once by a thread. The
+        distance matrices between blocks and chunks of training examples and the
+        indices used to select the k smallest distances of all threads must fit in the
+        memory budget.
+
+        :return: (*int*) -- number of test examples per block.
+        """
+        return max(1, self.memory_budget // (16 * self.chunk() * self.workers()))
+
+    def chunk(self):
+        """Get number of training examples read at once by the brute force search.
+
+        :return: (*int*) -- number of training examples per chunk.
+        """
+        if self.chunk_size is not None:
+            return max(1, self.chunk_size)
+        elif not isinstance(self.x_train, np.memmap):
+            return max(1, len(self.x_train))
+        else:
+            row = self.x_train.dtype.itemsize * np.prod(self.x_train.shape[1:])
+            return max(1, self.memory_budget // (4 * int(row) * self.workers()))
+
+    def _query_index(self, block):
+        """Find k-nearest training examples for a block of test examples using the
+        spatial index. Evicted training examples are skipped by the index search, and
+        training examples added since the index was built are searched by brute force.
+        Test examples for which fewer than k neighbors are found, e.g. when the random
+        projection forest lacks candidates, are searched by brute force.
+
+        :param numpy.ndarray block: block of test examples.
+        :return: (*numpy.ndarray*) -- indices of the closest training examples sorted by
+            increasing distance.
+        """
+        evicted = max(0, self.first - self.index_first)
+        distance, id = self.index.query(block, self.k, evicted)
+        distance = from_distance(distance, self.metric, self.p)
+        distance[id < 0] = np.inf
+        id = np.where(id < 0, -1, id + self.index_first - self.first)
+
+        start = max(0, self.index_last - self.first)
+        distance, id = self.search(block, start, len(self.x_train), distance, id)
+        order = np.argsort(distance, axis=1)[:, : min(self.k, len(self.x_train))]
+        id = np.take_along_axis(id, order, axis=1)
+        missing = (id < 0).any(axis=1)
+        if missing.any():
+            id[missing] = self._kneighbors(block[missing])
+        return id
+
+    def _kneighbors(self, block):
+        """Find k-nearest training examples for a block of test examples by brute
+        force.
+
+        :param numpy.ndarray block: block of test examples.
+        :return: (*numpy.ndarray*) -- indices of the closest training examples sorted by
+            increasing distance.
+        """
+        distance, id = self.search(block, 0, len(self.x_train))
+        order = np.argsort(distance, axis=1)
+        return np.take_along_axis(id, order, axis=1)
+
+    def search(self, block, start, stop, best_distance=None, best_id=None):
+        """Search k-nearest training examples of a block of test examples among a range
+        of training examples by brute force. The training examples are read in chunks
+        and the k closest training examples found so far are merged with those of each
+        chunk. Distances to a chunk are computed at once for the whole block.
+
+        :param numpy.ndarray block: block of test examples.
+        :param int start: first training example searched.
+        :param int stop: last training example searched (excluded).
+        :param numpy.ndarray best_distance: reduced distances of the closest training
+            examples already found.
+        :param numpy.ndarray best_id: indices of the closest training examples already
+            found.
+        :return: (*tuple*) -- reduced distances and indices of the closest training
+            examples, not sorted.
+        """
+        if best_id is None:
+            best_distance = np.empty((len(block), 0))
+            best_id = np.empty((len(block), 0), dtype=np.intp)
+        size = self.chunk()
+        for lo in range(start, stop, size):
+            hi = min(lo + size, stop)
+            if self.metric == "precomputed":
+                distance = block[:, lo:hi]
+            else:
+                chunk = np.asarray(self.x_train[lo:hi], dtype=float)
+                sq_norm = None if self.sq_norm is None else self.sq_norm[lo:hi]
+                distance = reduced_distance(block, chunk, self.metric, self.p, sq_norm)
+            previous = best_id.shape[1]
+            if previous > 0:
+                distance = np.hstack((best_distance, distance))
+
+            k = min(self.k, distance.shape[1])
+            keep = np.argpartition(distance, k - 1, axis=1)[:, :k]
+            best_distance = np.take_along_axis(distance, keep, axis=1)
+            id = lo + keep - previous
+            if previous > 0:
+                id = np.where(
+                    keep < previous,
+                    np.take_along_axis(best_id, np.minimum(keep, previous - 1), axis=1),
+                    id,
+                )
+            best_id = id
 
-        id = np.argsort(distance)
-        return (self.x_train[id][: self.k], self.y_train[id][: self.k])
+        return best_distance, best_id
 
     def predict(self, x_test):
         """Predict outcome.
@@ -54,17 +513,18 @@ class KNN:
         :param list b: second point.
         :return: (*float*) -- euclidean distance.
         """
-        return np.sqrt(np.sum(np.square([i - j for i, j in zip(a, b)])))
+        return np.sqrt(np.sum(np.square(np.subtract(a, b))))
 
 
 class KNNClassifier(KNN):
     """k-nearest neighbors classifier.
 
     :param int k: number of neighbor to consider for classification.
+    :param dict kwargs: optional parameters, see :class:`KNN`.
     """
 
-    def __init__(self, k):
-        super().__init__(k)
+    def __init__(self, k, **kwargs):
+        super().__init__(k, **kwargs)
 
     def predict(self, x_test):
         """Predict test examples using most common outcome among k-nearest neighbors.
@@ -72,7 +532,7 @@ class KNNClassifier(KNN):
         :param list x_test: test dataset. Each test example has the same number of
             features than a training example.
         """
-        neighbors = [self.find_neighbors(e)[1] for e in x_test]
+        neighbors = self.y_train[self.kneighbors(x_test)]
         return [Counter(n).most_common(1)[0][0] for n in neighbors]
 
 
@@ -80,10 +540,11 @@ class KNNRegressor(KNN):
     """k-nearest neighbors regressor.
 
     :param int k: number of neighbor to consider for regression.
+    :param dict kwargs: optional parameters, see :class:`KNN`.
     """
 
-    def __init__(self, k):
-        super().__init__(k)
+    def __init__(self, k, **kwargs):
+        super().__init__(k, **kwargs)
 
     def predict(self, x_test):
         """Predict test examples by calculating the mean of the outcomes of the
@@ -92,5 +553,5 @@ class KNNRegressor(KNN):
         :param list x_test: test dataset. Each test example has the same number of
             features than a training example.
         """
-        neighbors = [self.find_neighbors(e)[1] for e in x_test]
-        return [np.mean(n) for n in neighbors]
+        neighbors = self.y_train[self.kneighbors(x_test)]
+        return list(np.mean(neighbors, axis=1))
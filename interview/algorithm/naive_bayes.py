@@ -1,6 +1,7 @@
 from collections import Counter
 
 import numpy as np
+import scipy.sparse as sp
 
 
 class NaiveBayes:
@@ -10,27 +11,63 @@ class NaiveBayes:
     """
 
     def __init__(self):
-        self.x_train = None
-        self.y_train = None
-        self.classes = None
+        self.classes = []
+        self.class_count = {}
 
     def fit(self, x_train, y_train):
-        """Store training dataset.
+        """Learn statistics of training dataset. Statistics learned previously are
+        discarded.
 
         :param list x_train: training dataset. Each training example has several
             features.
         :param list y_train: outcomes of training dataset.
         """
-        self.x_train = x_train
-        self.y_train = y_train
-        self.classes = list(set(y_train))
+        self.reset()
+        self.partial_fit(x_train, y_train)
 
-    def arrange(self):
+    def fit_stream(self, batches):
+        """Learn statistics of a training dataset given in batches, e.g. read from a
+        generator. Only the statistics are kept in memory. Statistics learned
+        previously are discarded.
+
+        :param iterable batches: (x, y) tuples. Each tuple encloses training examples
+            and their outcomes.
+        """
+        self.reset()
+        for x, y in batches:
+            self.partial_fit(x, y)
+
+    def reset(self):
+        """Discard statistics learned."""
+        self.classes = []
+        self.class_count = {}
+
+    def partial_fit(self, x, y):
+        """Update statistics with new training examples.
+
+        :param list x: training examples. Each training example has several features.
+        :param list y: outcomes of training examples.
+        :raises NotImplementedError: method is implemented in child classes.
+        """
+        raise NotImplementedError("Implemented in child classes")
+
+    def arrange(self, x, y):
         """Group training examples by class
 
+        :param numpy.ndarray x: training examples.
+        :param numpy.ndarray y: outcomes of training examples.
         :return: (*dict*) -- dictionary giving training examples for each class.
         """
-        return {c: self.x_train[np.where(self.y_train == c)] for c in self.classes}
+        return {c: x[np.where(y == c)] for c in np.unique(y).tolist()}
+
+    def count(self, y):
+        """Update number of training examples of each class.
+
+        :param numpy.ndarray y: outcomes of new training examples.
+        """
+        for c, n in Counter(y.tolist()).items():
+            self.class_count[c] = self.class_count.get(c, 0) + n
+        self.classes = sorted(self.class_count)
 
     def calculate_prior(self):
         """The prior, P(y), of each class can be calculated as the relative frequency
@@ -39,10 +76,20 @@ class NaiveBayes:
         :return: (*dict*) -- dictionary giving relative frequency of each class in
             training set.
         """
-        return {k: v / len(self.y_train) for k, v in Counter(self.y_train).items()}
+        total = sum(self.class_count.values())
+        return {k: v / total for k, v in self.class_count.items()}
 
-    def predict(self, x_test):
-        """Predict outcome.
+    def log_prior(self):
+        """Calculate logarithm of the prior of each class.
+
+        :return: (*numpy.ndarray*) -- log prior, ordered as ``classes``.
+        """
+        prior = self.calculate_prior()
+        return np.log([prior[c] for c in self.classes])
+
+    def joint_log_likelihood(self, x_test):
+        """Calculate joint log likelihood, log P(x|y) + log P(y), of test examples for
+        each class.
 
         :param list x_test: test dataset. Each test example has the same number of
             features than a training example.
@@ -50,6 +97,39 @@ class NaiveBayes:
         """
         raise NotImplementedError("Implemented in child classes")
 
+    def predict(self, x_test):
+        """Predict test examples using Maximum A Posteriori (MAP) estimation.
+
+        :param list x_test: test dataset. Each test example has the same number of
+            features than a training example.
+        :return: (*list*) -- predicted classes.
+        """
+        jll = self.joint_log_likelihood(x_test)
+        return [self.classes[i] for i in np.argmax(jll, axis=1)]
+
+    def predict_log_proba(self, x_test):
+        """Calculate logarithm of the posterior of each class. The joint log likelihood
+        is normalized using the log-sum-exp trick.
+
+        :param list x_test: test dataset. Each test example has the same number of
+            features than a training example.
+        :return: (*numpy.ndarray*) -- array of shape (n_samples, n_classes) giving log
+            posterior, columns are ordered as ``classes``.
+        """
+        jll = self.joint_log_likelihood(x_test)
+        top = jll.max(axis=1, keepdims=True)
+        return jll - (top + np.log(np.exp(jll - top).sum(axis=1, keepdims=True)))
+
+    def predict_proba(self, x_test):
+        """Calculate posterior of each class.
+
+        :param list x_test: test dataset. Each test example has the same number of
+            features than a training example.
+        :return: (*numpy.ndarray*) -- array of shape (n_samples, n_classes) giving
+            posterior, columns are ordered as ``classes``.
+        """
+        return np.exp(self.predict_log_proba(x_test))
+
 
 class GaussianNaiveBayes(NaiveBayes):
     """Implements the Gaussian Naive Bayes algorithm for classification. The
@@ -58,20 +138,51 @@ class GaussianNaiveBayes(NaiveBayes):
 
     def __init__(self):
         super().__init__()
+        self.theta = {}
+        self.var = {}
+
+    def reset(self):
+        """Discard statistics learned."""
+        super().reset()
+        self.theta = {}
+        self.var = {}
+
+    def partial_fit(self, x, y):
+        """Update count, mean and variance of features for each class. Statistics of
+        new training examples are merged with the current ones using the parallel
+        algorithm of Chan et al., raw training examples are not stored.
+
+        :param list x: training examples. Each training example has several features.
+        :param list y: outcomes of training examples.
+        """
+        x, y = np.asarray(x, dtype=float), np.asarray(y)
+        for c, f in self.arrange(x, y).items():
+            n_b, mean_b, var_b = len(f), np.mean(f, axis=0), np.var(f, axis=0)
+            n_a = self.class_count.get(c, 0)
+            if n_a == 0:
+                self.theta[c], self.var[c] = mean_b, var_b
+                continue
+            n = n_a + n_b
+            delta = mean_b - self.theta[c]
+            self.theta[c] = self.theta[c] + delta * n_b / n
+            self.var[c] = (
+                n_a * self.var[c] + n_b * var_b + delta**2 * n_a * n_b / n
+            ) / n
+        self.count(y)
 
     def mean(self):
-        """Calculate mean of features for each class.
+        """Get mean of features for each class.
 
         :return: (*dict*) -- keys are classes' name, values are features' mean.
         """
-        return {c: np.mean(f, axis=0) for c, f in self.arrange().items()}
+        return dict(self.theta)
 
     def variance(self):
-        """Calculate variance of features for each class.
+        """Get variance of features for each class.
 
         :return: (*dict*) -- keys are classes' name, values are features' variance.
         """
-        return {c: np.var(f, axis=0) for c, f in self.arrange().items()}
+        return dict(self.var)
 
     def log_likelihood(self, example, mean, var):
         """Calculate probability of observing the example. The feature is assumed to be
@@ -82,27 +193,159 @@ class GaussianNaiveBayes(NaiveBayes):
         """
         return -0.5 * (pow(example - mean, 2) / var + np.log(2 * np.pi * var))
 
-    def predict(self, x_test):
-        """Predict test examples using Maximum A Posteriori (MAP) estimation.
+    def joint_log_likelihood(self, x_test):
+        """Calculate joint log likelihood of test examples for each class. The
+        Gaussian log likelihood of all examples, classes and features is computed at
+        once by broadcasting, using the precomputed log(2πσ²) and 1/σ² terms. The
+        squared deviation is kept in centered form, which does not lose precision
+        when the means are large compared to the standard deviations.
 
         :param list x_test: test dataset. Each test example has the same number of
             features than a training example.
+        :return: (*numpy.ndarray*) -- array of shape (n_samples, n_classes), columns are
+            ordered as ``classes``.
         """
-        mean = self.mean()
-        var = self.variance()
-        prior = self.calculate_prior()
-        prediction = []
-        for example in x_test:
-            log_posterior = [
-                np.log(prior[c])
-                + np.sum(
-                    [
-                        self.log_likelihood(f, mean[c][i], var[c][i])
-                        for i, f in enumerate(example)
-                    ]
-                )
-                for c in self.classes
-            ]
-            prediction.append(self.classes[np.argmax(log_posterior)])
-
-        return prediction
+        x = np.atleast_2d(np.asarray(x_test, dtype=float))
+        mean = np.array([self.theta[c] for c in self.classes])
+        var = np.array([self.var[c] for c in self.classes])
+        inverse = 1 / var
+        log_norm = np.log(2 * np.pi * var).sum(axis=1)
+        distance = (np.square(x[:, None, :] - mean) * inverse).sum(axis=-1)
+        return self.log_prior() - 0.5 * (distance + log_norm)
+
+
+class DiscreteNaiveBayes(NaiveBayes):
+    """Naive Bayes for discrete features, e.g. word counts. Training examples can be
+    given as a CSR sparse matrix, in which case they are never densified: feature
+    counts are summed over the sparse rows of each class and the log likelihood is
+    obtained by a sparse matrix product.
+
+    :param float alpha: additive smoothing parameter, 1 for Laplace smoothing and
+        lower than 1 for Lidstone smoothing.
+    """
+
+    def __init__(self, alpha=1.0):
+        super().__init__()
+        self.alpha = alpha
+        self.feature_count = {}
+
+    def reset(self):
+        """Discard statistics learned."""
+        super().reset()
+        self.feature_count = {}
+
+    def prepare(self, x):
+        """Convert examples to an array or CSR matrix of floats.
+
+        :param numpy.ndarray/scipy.sparse.spmatrix x: examples.
+        :return: (*numpy.ndarray/scipy.sparse.csr_matrix*) -- examples.
+        """
+        if sp.issparse(x):
+            return sp.csr_matrix(x, dtype=float)
+        return np.atleast_2d(np.asarray(x, dtype=float))
+
+    def partial_fit(self, x, y):
+        """Update sum of each feature over the training examples of each class.
+
+        :param numpy.ndarray/scipy.sparse.spmatrix x: training examples. Each training
+            example has several features.
+        :param list y: outcomes of training examples.
+        """
+        x, y = self.prepare(x), np.asarray(y)
+        for c, f in self.arrange(x, y).items():
+            count = np.asarray(f.sum(axis=0)).ravel()
+            self.feature_count[c] = self.feature_count.get(c, 0) + count
+        self.count(y)
+
+    def feature_log_prob(self):
+        """Calculate smoothed log probability of features given each class.
+
+        :raises NotImplementedError: method is implemented in child classes.
+        """
+        raise NotImplementedError("Implemented in child classes")
+
+
+class MultinomialNaiveBayes(DiscreteNaiveBayes):
+    """Implements the multinomial Naive Bayes algorithm for classification. Features
+    are counts, e.g. of words in a document, drawn from a multinomial distribution
+    for each class.
+
+    :param float alpha: additive smoothing parameter.
+    """
+
+    def __init__(self, alpha=1.0):
+        super().__init__(alpha=alpha)
+
+    def feature_log_prob(self):
+        """Calculate smoothed log probability of features given each class.
+
+        :return: (*numpy.ndarray*) -- array of shape (n_classes, n_features), rows are
+            ordered as ``classes``.
+        """
+        count = np.array([self.feature_count[c] for c in self.classes]) + self.alpha
+        return np.log(count) - np.log(count.sum(axis=1, keepdims=True))
+
+    def joint_log_likelihood(self, x_test):
+        """Calculate joint log likelihood of test examples for each class.
+
+        :param numpy.ndarray/scipy.sparse.spmatrix x_test: test dataset.
+        :return: (*numpy.ndarray*) -- array of shape (n_samples, n_classes), columns are
+            ordered as ``classes``.
+        """
+        return np.asarray(self.prepare(x_test) @ self.feature_log_prob().T) + (
+            self.log_prior()
+        )
+
+
+class BernoulliNaiveBayes(DiscreteNaiveBayes):
+    """Implements the Bernoulli Naive Bayes algorithm for classification. Features are
+    binary, e.g. occurrence of words in a document, and drawn from a Bernoulli
+    distribution for each class. Absent features are penalized.
+
+    :param float alpha: additive smoothing parameter.
+    :param float binarize: threshold above which features are considered present.
+    """
+
+    def __init__(self, alpha=1.0, binarize=0.0):
+        super().__init__(alpha=alpha)
+        self.binarize = binarize
+
+    def prepare(self, x):
+        """Convert examples to an array or CSR matrix of binary features.
+
+        :param numpy.ndarray/scipy.sparse.spmatrix x: examples.
+        :return: (*numpy.ndarray/scipy.sparse.csr_matrix*) -- binary examples.
+        """
+        x = super().prepare(x)
+        if sp.issparse(x):
+            x = x.copy()
+            x.data = (x.data > self.binarize).astype(float)
+            x.eliminate_zeros()
+            return x
+        return (x > self.binarize).astype(float)
+
+    def feature_log_prob(self):
+        """Calculate smoothed log probability of features being present given each
+        class.
+
+        :return: (*numpy.ndarray*) -- array of shape (n_classes, n_features), rows are
+            ordered as ``classes``.
+        """
+        count = np.array([self.feature_count[c] for c in self.classes])
+        total = np.array([self.class_count[c] for c in self.classes])[:, None]
+        return np.log(count + self.alpha) - np.log(total + 2 * self.alpha)
+
+    def joint_log_likelihood(self, x_test):
+        """Calculate joint log likelihood of test examples for each class. The
+        likelihood of absent features is accounted for without densifying the test
+        examples: log(1 - p) is summed over all features and corrected for the
+        present ones.
+
+        :param numpy.ndarray/scipy.sparse.spmatrix x_test: test dataset.
+        :return: (*numpy.ndarray*) -- array of shape (n_samples, n_classes), columns are
+            ordered as ``classes``.
+        """
+        log_prob = self.feature_log_prob()
+        log_absent = np.log1p(-np.exp(log_prob))
+        jll = np.asarray(self.prepare(x_test) @ (log_prob - log_absent).T)
+        return jll + log_absent.sum(axis=1) + self.log_prior()
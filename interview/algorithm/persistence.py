@@ -0,0 +1,153 @@
+import importlib
+import json
+import mmap
+import struct
+
+import numpy as np
+
+MAGIC = b"IVWMODEL"
+VERSION = 1
+ALIGNMENT = 64
+PREAMBLE = struct.Struct("<8sII")
+
+
+def save(model, path):
+    """Save fitted model in a binary file. The file starts with a preamble giving the
+    format version and the size of a JSON header. The header describes the model:
+    class, scalar attributes and location of the arrays. Arrays follow the header,
+    each stored contiguously at an offset aligned on 64 bytes.
+
+    :param object model: fitted model, e.g. a
+        :class:`interview.algorithm.knn.KNNClassifier` or a
+        :class:`interview.algorithm.naive_bayes.GaussianNaiveBayes`.
+    :param str path: path to file.
+    """
+    arrays = []
+    model = encode(model, arrays, {})
+    table, offset = [], 0
+    for a in arrays:
+        table.append({"dtype": a.dtype.str, "shape": a.shape, "offset": offset})
+        offset = align(offset + a.nbytes)
+    header = json.dumps({"model": model, "arrays": table}).encode()
+    start = align(PREAMBLE.size + len(header))
+
+    with open(path, "wb") as f:
+        f.write(PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        for a, t in zip(arrays, table):
+            f.seek(start + t["offset"])
+            f.write(np.ascontiguousarray(a).tobytes())
+
+
+def load(path):
+    """Load model saved by :func:`save`. Arrays are not copied: they are read-only
+    views of the file mapped in memory, whose pages are shared through the OS page
+    cache by all processes loading the same file.
+
+    :param str path: path to file.
+    :return: (*object*) -- model.
+    :raises ValueError: if file is not a model file or if its version is not
+        supported.
+    """
+    with open(path, "rb") as f:
+        magic, version, size = PREAMBLE.unpack(f.read(PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError("not a model file")
+        if version != VERSION:
+            raise ValueError(f"unsupported model file version: {version}")
+        header = json.loads(f.read(size))
+        start = align(PREAMBLE.size + size)
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    arrays = []
+    for t in header["arrays"]:
+        count = int(np.prod(t["shape"]))
+        a = (
+            np.frombuffer(buffer, t["dtype"], count, start + t["offset"])
+            if count > 0
+            else np.empty(0, dtype=t["dtype"])
+        )
+        arrays.append(a.reshape(t["shape"]))
+    return decode(header["model"], arrays)
+
+
+def align(offset):
+    """Round offset up to the next multiple of the alignment.
+
+    :param int offset: offset in bytes.
+    :return: (*int*) -- aligned offset.
+    """
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def encode(value, arrays, seen):
+    """Convert value to JSON serializable structure. Arrays are replaced by their
+    position in ``arrays``, an array referenced several times is stored once.
+
+    :param object value: value to encode.
+    :param list arrays: arrays found so far.
+    :param dict seen: position in ``arrays`` of the arrays found so far, keyed by id.
+    :return: (*object*) -- JSON serializable structure.
+    :raises TypeError: if value cannot be encoded.
+    """
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            raise TypeError("arrays of objects cannot be saved")
+        if id(value) not in seen:
+            seen[id(value)] = len(arrays)
+            arrays.append(value)
+        return {"array": seen[id(value)]}
+    elif isinstance(value, np.generic):
+        return value.item()
+    elif value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    elif isinstance(value, (list, tuple)):
+        return {"list": [encode(v, arrays, seen) for v in value]}
+    elif isinstance(value, dict):
+        return {
+            "dict": [
+                [encode(k, arrays, seen), encode(v, arrays, seen)]
+                for k, v in value.items()
+            ]
+        }
+    elif type(value).__module__.startswith("interview."):
+        getstate = getattr(type(value), "__getstate__", None)
+        if getstate is None or getstate is getattr(object, "__getstate__", None):
+            state = value.__dict__
+        else:
+            state = value.__getstate__()
+        return {
+            "object": f"{type(value).__module__}:{type(value).__qualname__}",
+            "state": encode(state, arrays, seen),
+        }
+    else:
+        raise TypeError(f"{type(value).__name__} cannot be saved")
+
+
+def decode(value, arrays):
+    """Rebuild value encoded by :func:`encode`.
+
+    :param object value: JSON structure.
+    :param list arrays: arrays, in the order they were found when encoding.
+    :return: (*object*) -- value.
+    :raises ValueError: if an object is not defined in the interview package.
+    """
+    if not isinstance(value, dict):
+        return value
+    elif "array" in value:
+        return arrays[value["array"]]
+    elif "list" in value:
+        return [decode(v, arrays) for v in value["list"]]
+    elif "dict" in value:
+        return {decode(k, arrays): decode(v, arrays) for k, v in value["dict"]}
+
+    module, name = value["object"].split(":")
+    if not module.startswith("interview."):
+        raise ValueError(f"{value['object']} cannot be loaded")
+    obj = object.__new__(getattr(importlib.import_module(module), name))
+    state = decode(value["state"], arrays)
+    if hasattr(obj, "__setstate__"):
+        obj.__setstate__(state)
+    else:
+        obj.__dict__.update(state)
+    return obj
@@ -1,32 +1,391 @@
-def quicksort(array, low=0, high=None, inplace=True):
+import math
+from array import ArrayType
+
+import numpy as np
+
+INSERTION_THRESHOLD = 16
+RUN = 32
+COUNTING_RANGE = 2**16
+RADIX_BITS = 16
+
+
+def quicksort(
+    array, low=0, high=None, inplace=True, key=None, reverse=False, stable=False
+):
     """Sort array in ascending order. Time complexity is Nlog(N).
 
     :param list array: unordered list of numbers/letters.
     :param int low: leftmost index of array for sorting.
     :param int high: rightmost index of array for sorting.
-    :param bool inplace: done in place, space complexity is O(1).
+    :param bool inplace: done in place using :func:`introsort`, space complexity is
+        O(log(N)).
+    :param callable key: function extracting the comparison key of each element.
+    :param bool reverse: sort in descending order.
+    :param bool stable: equal elements keep their relative order. Always the case
+        when ``key`` is given or ``reverse`` is True.
     :return: (*list*) -- ordered list of numbers/letters when ``inplace`` is False.
+        NumPy arrays and ``array.array`` of integers or floats are sorted by
+        :func:`numeric_sort` and an array of the same type is returned.
+    """
+    high = len(array) - 1 if high is None else high
+    if key is None and typed_view(array) is not None:
+        if inplace:
+            numeric_sort(typed_view(array)[low : high + 1], reverse)
+        else:
+            result = array[low : high + 1]
+            result = result.copy() if isinstance(result, np.ndarray) else result
+            numeric_sort(result, reverse)
+            return result
+    elif key is None and not reverse and not stable:
+        if inplace:
+            introsort(array, low, high)
+        else:
+            result = list(array[low : high + 1])
+            introsort(result)
+            return result
+    elif inplace:
+        array[low : high + 1] = mergesort(array[low : high + 1], key, reverse)
+    else:
+        return mergesort(array[low : high + 1], key, reverse)
+
+
+def mergesort(array, key=None, reverse=False):
+    """Sort array in a new list. Stable: equal elements keep their relative order.
+    Runs of 32 elements are sorted by insertion sort, then merged bottom-up back and
+    forth between the copy of array and a single buffer of the same size. Time
+    complexity is O(Nlog(N)), space complexity is O(N).
+
+    :param iterable array: unordered numbers/letters.
+    :param callable key: function extracting the comparison key of each element.
+    :param bool reverse: sort in descending order.
+    :return: (*list*) -- ordered list of numbers/letters.
     """
-    if inplace:
-        high = len(array) - 1 if high is None else high
+    values = list(array)
+    # Stable sort of the reversed input, reversed back, keeps equal elements in order
+    if reverse:
+        values.reverse()
+    keys = values if key is None else [key(v) for v in values]
+    values = None if key is None else values
+    n = len(keys)
+
+    for low in range(0, n, RUN):
+        insertion_sort(keys, low, min(low + RUN, n) - 1, values)
+
+    src_keys, src_values = keys, values
+    dst_keys, dst_values = [None] * n, None if values is None else [None] * n
+    width = RUN
+    while width < n:
+        for low in range(0, n, 2 * width):
+            mid, high = min(low + width, n), min(low + 2 * width, n)
+            merge(src_keys, src_values, dst_keys, dst_values, low, mid, high)
+        src_keys, dst_keys = dst_keys, src_keys
+        src_values, dst_values = dst_values, src_values
+        width *= 2
+
+    result = src_keys if values is None else src_values
+    if reverse:
+        result.reverse()
+    return result
 
-        if low < high:
-            # Get pivot index
-            pi = partition(array, low, high)
-            # Sort left of pivot
-            quicksort(array, low, pi - 1)
-            # Sort right of pivot
-            quicksort(array, pi + 1, high)
+
+def merge(keys, values, out_keys, out_values, low, mid, high):
+    """Merge two consecutive sorted ranges. Stable: on ties the element of the left
+    range comes first.
+
+    :param list keys: keys, sorted from ``low`` to ``mid`` and from ``mid`` to
+        ``high``.
+    :param list values: values moved along with their keys, None if keys are the
+        values.
+    :param list out_keys: buffer receiving the merged keys.
+    :param list out_values: buffer receiving the merged values, None if keys are the
+        values.
+    :param int low: start of the left range.
+    :param int mid: end of the left range, start of the right range.
+    :param int high: end of the right range.
+    """
+    if mid >= high or not keys[mid] < keys[mid - 1]:
+        # Ranges are already in order
+        out_keys[low:high] = keys[low:high]
+        if values is not None:
+            out_values[low:high] = values[low:high]
+        return
+
+    i, j = low, mid
+    for k in range(low, high):
+        if j < high and (i >= mid or keys[j] < keys[i]):
+            out_keys[k] = keys[j]
+            if values is not None:
+                out_values[k] = values[j]
+            j += 1
+        else:
+            out_keys[k] = keys[i]
+            if values is not None:
+                out_values[k] = values[i]
+            i += 1
+
+
+def typed_view(array):
+    """Get NumPy view of the buffer of an array of fixed width numbers.
+
+    :param object array: NumPy array or ``array.array``.
+    :return: (*numpy.ndarray*) -- one dimensional view sharing memory with array, None
+        if array is not an array of integers or floats.
+    """
+    if isinstance(array, ArrayType):
+        if array.typecode in "uw":
+            return None
+        array = np.frombuffer(array, dtype=array.typecode)
+    if not isinstance(array, np.ndarray) or array.ndim != 1:
+        return None
+    return array if array.dtype.kind in "iuf" else None
+
+
+def numeric_sort(array, reverse=False):
+    """Sort array of fixed width numbers. Done inplace, in the buffer of array.
+    Integers spanning a small range are sorted by :func:`counting_sort`, other
+    numbers by :func:`radix_sort`. Time complexity is O(N).
+
+    :param object array: NumPy array or ``array.array`` of integers or floats.
+    :param bool reverse: sort in descending order.
+    :raises TypeError: if array is not an array of integers or floats.
+    """
+    view = typed_view(array)
+    if view is None:
+        raise TypeError("array must be a NumPy array or array.array of numbers")
+    if len(view) < 2:
+        return
+
+    if view.dtype.kind != "f" and int(view.max()) - int(view.min()) <= max(
+        len(view), COUNTING_RANGE
+    ):
+        counting_sort(view)
+    else:
+        radix_sort(view)
+    if reverse:
+        view[:] = view[::-1].copy()
+
+
+def counting_sort(array):
+    """Sort array of integers by counting occurrences of each value between the
+    minimum and the maximum. Done inplace. Time complexity is O(N + R), where R is
+    the range of values.
+
+    :param object array: NumPy array or ``array.array`` of integers.
+    :raises TypeError: if array is not an array of integers.
+    """
+    view = typed_view(array)
+    if view is None or view.dtype.kind == "f":
+        raise TypeError("array must be a NumPy array or array.array of integers")
+    if len(view) < 2:
+        return
+
+    low, high = view.min(), view.max()
+    # Wrapping subtraction in the width of the array, offsets fit the unsigned type
+    offset = (view - low).view(f"u{view.itemsize}").astype(np.intp)
+    count = np.bincount(offset, minlength=int(high) - int(low) + 1)
+    view[:] = np.repeat(np.arange(int(low), int(high) + 1, dtype=view.dtype), count)
+
+
+def radix_sort(array):
+    """Sort array of fixed width numbers by least significant digit radix sort on 16
+    bits digits. Numbers are mapped to unsigned integers in the same order: the sign
+    bit of integers is flipped, all bits of negative floats are flipped and only the
+    sign bit of positive ones. Digits above the highest bit differing between the
+    smallest and largest keys are skipped. Done inplace. Time complexity is O(wN),
+    where w is the number of digits.
+
+    NaN are ordered by their sign bit: negative NaN first, positive NaN last.
+
+    :param object array: NumPy array or ``array.array`` of integers or floats.
+    :raises TypeError: if array is not an array of integers or floats.
+    """
+    view = typed_view(array)
+    if view is None:
+        raise TypeError("array must be a NumPy array or array.array of numbers")
+    if len(view) < 2:
+        return
+
+    unsigned = np.dtype(f"u{view.itemsize}")
+    sign = unsigned.type(1 << (8 * view.itemsize - 1))
+    key = view.view(unsigned)
+    if view.dtype.kind == "i":
+        key = key ^ sign
+    elif view.dtype.kind == "f":
+        key = np.where(key & sign, ~key, key ^ sign)
     else:
-        if len(array) <= 1:
-            return array
+        key = key.copy()
+
+    bits = (int(key.max()) ^ int(key.min())).bit_length()
+    for shift in range(0, bits, RADIX_BITS):
+        digit = (key >> unsigned.type(shift)).astype(np.uint16)
+        # Stable sort of 16 bits integers is a counting sort in NumPy
+        key = key[np.argsort(digit, kind="stable")]
+
+    if view.dtype.kind == "i":
+        key ^= sign
+    elif view.dtype.kind == "f":
+        key = np.where(key & sign, key ^ sign, ~key)
+    view[:] = key.view(view.dtype)
+
+
+def introsort(array, low=0, high=None):
+    """Sort array in ascending order. Done inplace. Quicksort using a median-of-three
+    pivot, or Tukey's ninther for large ranges, and a three-way partitioning that
+    groups elements equal to the pivot. Small ranges are sorted by insertion sort and
+    ranges partitioned too many times are sorted by heapsort. Time complexity is
+    O(Nlog(N)) in the worst case.
+
+    The smaller side of each partition is sorted first and the larger one is pushed
+    on an explicit stack, space complexity is O(log(N)).
+
+    :param list array: unordered list of numbers/letters.
+    :param int low: leftmost index of array for sorting.
+    :param int high: rightmost index of array for sorting.
+    """
+    high = len(array) - 1 if high is None else high
+    if high - low < 1:
+        return
+
+    stack = [(low, high, 2 * int(math.log2(high - low + 1)))]
+    while stack:
+        low, high, depth = stack.pop()
+        while high - low >= INSERTION_THRESHOLD:
+            if depth == 0:
+                heapsort(array, low, high)
+                break
+            depth -= 1
+            lt, gt = partition3(array, low, high, choose_pivot(array, low, high))
+            if lt - low < high - gt:
+                stack.append((gt + 1, high, depth))
+                high = lt - 1
+            else:
+                stack.append((low, lt - 1, depth))
+                low = gt + 1
         else:
-            pivot = array[0]
-            return (
-                quicksort([x for x in array[1:] if x < pivot], inplace=False)
-                + [pivot]
-                + quicksort([x for x in array[1:] if x > pivot], inplace=False)
-            )
+            insertion_sort(array, low, high)
+
+
+def choose_pivot(array, low, high):
+    """Choose pivot as the median of three elements, or the median of three medians
+    of three (Tukey's ninther) for ranges of more than 40 elements.
+
+    :param list array: list of numbers/letters.
+    :param int low: leftmost index of range.
+    :param int high: rightmost index of range.
+    :return: (*object*) -- pivot value.
+    """
+    mid = (low + high) // 2
+    if high - low < 40:
+        return median3(array[low], array[mid], array[high])
+    step = (high - low) // 8
+    return median3(
+        median3(array[low], array[low + step], array[low + 2 * step]),
+        median3(array[mid - step], array[mid], array[mid + step]),
+        median3(array[high - 2 * step], array[high - step], array[high]),
+    )
+
+
+def median3(a, b, c):
+    """Find median of three values.
+
+    :param object a: first value.
+    :param object b: second value.
+    :param object c: third value.
+    :return: (*object*) -- median value.
+    """
+    if a < b:
+        return b if b < c else (c if a < c else a)
+    return a if a < c else (c if b < c else b)
+
+
+def partition3(array, low, high, pivot):
+    """Partition range in three parts (Dutch national flag): elements lower than,
+    equal to and greater than the pivot.
+
+    :param list array: list of numbers/letters.
+    :param int low: leftmost index of range.
+    :param int high: rightmost index of range.
+    :param object pivot: pivot value.
+    :return: (*tuple*) -- leftmost and rightmost indices of elements equal to pivot.
+    """
+    lt, i, gt = low, low, high
+    while i <= gt:
+        value = array[i]
+        if value < pivot:
+            array[i] = array[lt]
+            array[lt] = value
+            lt += 1
+            i += 1
+        elif pivot < value:
+            array[i] = array[gt]
+            array[gt] = value
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+
+def insertion_sort(array, low=0, high=None, values=None):
+    """Sort range in ascending order. Done inplace. Stable. Time complexity is O(N^2),
+    fast for small ranges.
+
+    :param list array: unordered list of numbers/letters.
+    :param int low: leftmost index of range.
+    :param int high: rightmost index of range.
+    :param list values: values moved along with the elements of array, e.g. records
+        sorted by the keys in array.
+    """
+    high = len(array) - 1 if high is None else high
+    for i in range(low + 1, high + 1):
+        element = array[i]
+        j = i - 1
+        while j >= low and element < array[j]:
+            j -= 1
+        if j + 1 < i:
+            array[j + 2 : i + 1] = array[j + 1 : i]
+            array[j + 1] = element
+            if values is not None:
+                value = values[i]
+                values[j + 2 : i + 1] = values[j + 1 : i]
+                values[j + 1] = value
+
+
+def heapsort(array, low=0, high=None):
+    """Sort range in ascending order. Done inplace. Time complexity is O(Nlog(N)) in
+    the worst case, space complexity is O(1).
+
+    :param list array: unordered list of numbers/letters.
+    :param int low: leftmost index of range.
+    :param int high: rightmost index of range.
+    """
+    high = len(array) - 1 if high is None else high
+    n = high - low + 1
+    for root in range(n // 2 - 1, -1, -1):
+        sift_down(array, low, root, n)
+    for end in range(n - 1, 0, -1):
+        array[low], array[low + end] = array[low + end], array[low]
+        sift_down(array, low, 0, end)
+
+
+def sift_down(array, offset, root, size):
+    """Move element down a max heap until both children are lower.
+
+    :param list array: list of numbers/letters.
+    :param int offset: index of the heap root in array.
+    :param int root: position of the element in the heap.
+    :param int size: number of elements of the heap.
+    """
+    value = array[offset + root]
+    child = 2 * root + 1
+    while child < size:
+        if child + 1 < size and array[offset + child] < array[offset + child + 1]:
+            child += 1
+        if not value < array[offset + child]:
+            break
+        array[offset + root] = array[offset + child]
+        root = child
+        child = 2 * root + 1
+    array[offset + root] = value
 
 
 def partition(array, low, high):
@@ -52,6 +411,124 @@ def partition(array, low, high):
     return pb - 1
 
 
+def quickselect(array, k, low=0, high=None):
+    """Select the k-th smallest element, like ``nth_element``. Done inplace: the
+    element is moved to index k, lower or equal elements to its left and greater or
+    equal elements to its right. The range is narrowed by :func:`partition` around a
+    median-of-three pivot. When partitioning has processed more than four times the
+    number of elements, the pivot is chosen by median of medians and the range is
+    partitioned in three parts (introselect). Time complexity is O(N) in the worst
+    case.
+
+    :param list array: unordered list of numbers/letters.
+    :param int k: index of the element in the sorted range.
+    :param int low: leftmost index of range.
+    :param int high: rightmost index of range.
+    :return: (*object*) -- k-th smallest element.
+    :raises IndexError: if k is out of range.
+    """
+    high = len(array) - 1 if high is None else high
+    if not low <= k <= high:
+        raise IndexError("k is out of range")
+
+    budget = 4 * (high - low + 1)
+    while high - low >= INSERTION_THRESHOLD:
+        if budget > 0:
+            budget -= high - low + 1
+            mid = (low + high) // 2
+            if array[mid] < array[low]:
+                array[low], array[mid] = array[mid], array[low]
+            if array[high] < array[low]:
+                array[low], array[high] = array[high], array[low]
+            if array[high] < array[mid]:
+                array[mid], array[high] = array[high], array[mid]
+            # Median of three is the pivot of partition
+            array[low], array[mid] = array[mid], array[low]
+            lt = gt = partition(array, low, high)
+        else:
+            lt, gt = partition3(array, low, high, median_of_medians(array, low, high))
+        if k < lt:
+            high = lt - 1
+        elif k > gt:
+            low = gt + 1
+        else:
+            return array[k]
+    insertion_sort(array, low, high)
+    return array[k]
+
+
+def median_of_medians(array, low, high):
+    """Find an approximate median that is greater than 30% and lower than 30% of the
+    elements of a range. The medians of groups of five elements are moved to the
+    beginning of the range and their median is selected by :func:`quickselect`.
+
+    :param list array: list of numbers/letters.
+    :param int low: leftmost index of range.
+    :param int high: rightmost index of range.
+    :return: (*object*) -- pivot value.
+    """
+    medians = low
+    for start in range(low, high + 1, 5):
+        stop = min(start + 4, high)
+        insertion_sort(array, start, stop)
+        median = (start + stop) // 2
+        array[medians], array[median] = array[median], array[medians]
+        medians += 1
+    return quickselect(array, (low + medians - 1) // 2, low, medians - 1)
+
+
+def partial_sort(array, k, low=0, high=None):
+    """Sort the k smallest elements of range in ascending order. Done inplace, the
+    order of the other elements is unspecified. Time complexity is O(N + klog(k)).
+
+    :param list array: unordered list of numbers/letters.
+    :param int k: number of elements to sort.
+    :param int low: leftmost index of range.
+    :param int high: rightmost index of range.
+    """
+    high = len(array) - 1 if high is None else high
+    k = min(k, high - low + 1)
+    if k <= 0:
+        return
+    if k < high - low + 1:
+        quickselect(array, low + k - 1, low, high)
+    introsort(array, low, low + k - 1)
+
+
+def topk(iterable, k, key=None):
+    """Find the k smallest elements. Elements with equal keys keep their relative
+    order. Lists are selected by :func:`partial_sort` on a copy when no key is given,
+    other iterables are streamed through a max heap of size k. Time complexity is
+    O(N) for lists and O(Nlog(k)) for streams, memory used is O(k) for streams.
+
+    :param iterable iterable: numbers/letters, or records when ``key`` is given.
+    :param int k: number of elements.
+    :param callable key: function extracting the comparison key of each element.
+    :return: (*list*) -- k smallest elements in ascending order.
+    """
+    if k <= 0:
+        return []
+    if key is None and isinstance(iterable, list):
+        result = list(iterable)
+        partial_sort(result, k)
+        return result[:k]
+
+    # Entries are ordered by key then position, the largest one is at the root
+    heap = []
+    for i, value in enumerate(iterable):
+        entry = (value if key is None else key(value), i, value)
+        if len(heap) < k:
+            heap.append(entry)
+            if len(heap) == k:
+                for root in range(k // 2 - 1, -1, -1):
+                    sift_down(heap, 0, root, k)
+        elif entry < heap[0]:
+            heap[0] = entry
+            sift_down(heap, 0, 0, k)
+    heapsort(heap)
+    return [value for _, _, value in heap]
+
+
 def bubblesort(array):
     """Sort array in ascending order. Done inplace.
     Time complexity is O(N^2), space complexity is O(1).
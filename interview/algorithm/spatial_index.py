@@ -0,0 +1,460 @@
+import numpy as np
+
+from interview.algorithm.distance import (
+    candidate_distance,
+    from_distance,
+    reduced_norm,
+    to_distance,
+)
+
+
+class SpatialTree:
+    """Binary space partitioning tree used to answer nearest neighbors queries without
+    scanning the whole training dataset. Nodes are not Python objects: they are stored
+    in flat arrays indexed by node id. Each node covers a contiguous slice of
+    ``index``, a permutation of the training examples, and its children ids are given
+    by ``left`` and ``right`` (-1 for leaves).
+
+    :param numpy.ndarray data: training examples, array of shape (n_samples,
+        n_features).
+    :param int leaf_size: maximum number of training examples in a leaf.
+    :param str metric: name of the metric, any metric of
+        :mod:`interview.algorithm.distance` but cosine.
+    :param float p: power of the minkowski metric.
+    :raises ValueError: if ``metric`` is cosine.
+    """
+
+    def __init__(self, data, leaf_size=30, metric="euclidean", p=2):
+        if metric == "cosine":
+            raise ValueError("cosine metric is not supported by spatial trees")
+        self.data = data
+        self.leaf_size = max(1, leaf_size)
+        self.metric = metric
+        self.p = p
+        self.index = np.arange(len(data))
+        self.build()
+
+    def build(self):
+        """Build tree. Each node is split at the median of the projection of its
+        training examples until nodes have less than ``leaf_size`` training examples.
+        """
+        start, end, left, right = [0], [len(self.data)], [-1], [-1]
+        bounds = [self.bound(0, len(self.data))]
+        direction, split_value = [None], [np.nan]
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            lo, hi = start[node], end[node]
+            if hi - lo <= self.leaf_size:
+                continue
+            projection, direction[node] = self.split(self.data[self.index[lo:hi]])
+            mid = (hi - lo) // 2
+            order = np.argpartition(projection, mid)
+            split_value[node] = projection[order[mid]]
+            self.index[lo:hi] = self.index[lo:hi][order]
+            for child, (s, e) in zip((left, right), ((lo, lo + mid), (lo + mid, hi))):
+                child[node] = len(start)
+                start.append(s)
+                end.append(e)
+                left.append(-1)
+                right.append(-1)
+                bounds.append(self.bound(s, e))
+                direction.append(None)
+                split_value.append(np.nan)
+                stack.append(child[node])
+
+        self.start = np.array(start, dtype=np.intp)
+        self.end = np.array(end, dtype=np.intp)
+        self.left = np.array(left, dtype=np.intp)
+        self.right = np.array(right, dtype=np.intp)
+        self.split_value = np.array(split_value)
+        self.store_splits(direction)
+        self.store_bounds(bounds)
+
+    def split(self, points):
+        """Project training examples of a node on the feature with the largest spread.
+
+        :param numpy.ndarray points: training examples of the node.
+        :return: (*tuple*) -- projection of the training examples and feature used.
+        """
+        dim = np.argmax(points.max(axis=0) - points.min(axis=0))
+        return points[:, dim], dim
+
+    def store_splits(self, direction):
+        """Store feature used to split each node, -1 for leaves.
+
+        :param list direction: feature used to split each node, None for leaves.
+        """
+        self.split_dim = np.array(
+            [-1 if d is None else d for d in direction], dtype=np.intp
+        )
+
+    def bound(self, start, end):
+        """Calculate bounding volume of a node.
+
+        :param int start: first position of the node in ``index``.
+        :param int end: last position (excluded) of the node in ``index``.
+        :raises NotImplementedError: method is implemented in child classes.
+        """
+        raise NotImplementedError("Implemented in child classes")
+
+    def store_bounds(self, bounds):
+        """Store bounding volumes of the nodes in flat arrays.
+
+        :param list bounds: bounding volume of each node.
+        :raises NotImplementedError: method is implemented in child classes.
+        """
+        raise NotImplementedError("Implemented in child classes")
+
+    def min_distance(self, node, x):
+        """Calculate a lower bound of the reduced distance between a point and the
+        training examples of nodes.
+
+        :param list node: node ids.
+        :param numpy.ndarray x: query point.
+        :raises NotImplementedError: method is implemented in child classes.
+        """
+        raise NotImplementedError("Implemented in child classes")
+
+    def query(self, x_test, k, first=0):
+        """Find k-nearest training examples of each test example.
+
+        :param numpy.ndarray x_test: test examples, array of shape (n_test,
+            n_features).
+        :param int k: number of neighbors.
+        :param int first: training examples with a lower index are skipped, e.g.
+            evicted ones. Missing neighbors have index -1 and infinite distance.
+        :return: (*tuple*) -- distances and indices of the closest training examples,
+            both arrays of shape (n_test, k) sorted by increasing distance.
+        """
+        k = min(k, len(self.data))
+        distance = np.empty((len(x_test), k))
+        index = np.empty((len(x_test), k), dtype=np.intp)
+        for i, x in enumerate(x_test):
+            distance[i], index[i] = self._query(x, k, first)
+        return to_distance(distance, self.metric, self.p), index
+
+    def _query(self, x, k, first=0):
+        """Find k-nearest training examples of a test example with a depth-first
+        search visiting the closest child first and pruning nodes that cannot contain
+        a closer training example than the current k-th neighbor.
+
+        :param numpy.ndarray x: test example.
+        :param int k: number of neighbors.
+        :param int first: training examples with a lower index are skipped.
+        :return: (*tuple*) -- reduced distances and indices of the closest training
+            examples sorted by increasing distance.
+        """
+        best_distance = np.full(k, np.inf)
+        best_index = np.full(k, -1, dtype=np.intp)
+        worst = np.inf
+        stack = [(0.0, 0)]
+        while stack:
+            bound, node = stack.pop()
+            if bound > worst:
+                continue
+            left, right = self.left[node], self.right[node]
+            if left == -1:
+                id = self.index[self.start[node] : self.end[node]]
+                if first > 0:
+                    id = id[id >= first]
+                distance = reduced_norm(self.data[id] - x, self.metric, self.p)
+                closer = distance < worst
+                if not closer.any():
+                    continue
+                distance = np.concatenate((best_distance, distance[closer]))
+                id = np.concatenate((best_index, id[closer]))
+                keep = np.argpartition(distance, k - 1)[:k]
+                best_distance, best_index = distance[keep], id[keep]
+                worst = best_distance.max()
+                continue
+            bound = self.min_distance([left, right], x)
+            if bound[0] > bound[1]:
+                stack.extend(((bound[0], left), (bound[1], right)))
+            else:
+                stack.extend(((bound[1], right), (bound[0], left)))
+
+        order = np.argsort(best_distance)
+        return best_distance[order], best_index[order]
+
+
+class KDTree(SpatialTree):
+    """k-d tree. Each node is bounded by the axis-aligned box enclosing its training
+    examples.
+
+    :param numpy.ndarray data: training examples.
+    :param int leaf_size: maximum number of training examples in a leaf.
+    """
+
+    def bound(self, start, end):
+        """Calculate the axis-aligned bounding box of a node.
+
+        :param int start: first position of the node in ``index``.
+        :param int end: last position (excluded) of the node in ``index``.
+        :return: (*tuple*) -- lower and upper corners of the box.
+        """
+        points = self.data[self.index[start:end]]
+        return points.min(axis=0), points.max(axis=0)
+
+    def store_bounds(self, bounds):
+        """Store boxes in two arrays of shape (n_nodes, n_features).
+
+        :param list bounds: lower and upper corners of the box of each node.
+        """
+        self.lower = np.array([b[0] for b in bounds])
+        self.upper = np.array([b[1] for b in bounds])
+
+    def min_distance(self, node, x):
+        """Calculate reduced distance between a point and the box of nodes.
+
+        :param list node: node ids.
+        :param numpy.ndarray x: query point.
+        :return: (*numpy.ndarray*) -- reduced distances, 0 if the point is inside the
+            box.
+        """
+        gap = np.maximum(self.lower[node] - x, 0) + np.maximum(x - self.upper[node], 0)
+        return reduced_norm(gap, self.metric, self.p)
+
+
+class BallTree(SpatialTree):
+    """Ball tree. Each node is bounded by the hypersphere centered on the centroid of
+    its training examples. Bounds rely on the triangle inequality, the squared
+    euclidean metric is handled with euclidean balls.
+
+    :param numpy.ndarray data: training examples.
+    :param int leaf_size: maximum number of training examples in a leaf.
+    :param str metric: name of the metric, cosine excluded.
+    :param float p: power of the minkowski metric.
+    """
+
+    def __init__(self, data, leaf_size=30, metric="euclidean", p=2):
+        self.geometry = "euclidean" if metric == "sqeuclidean" else metric
+        super().__init__(data, leaf_size=leaf_size, metric=metric, p=p)
+
+    def bound(self, start, end):
+        """Calculate the bounding ball of a node.
+
+        :param int start: first position of the node in ``index``.
+        :param int end: last position (excluded) of the node in ``index``.
+        :return: (*tuple*) -- centroid and radius of the ball.
+        """
+        points = self.data[self.index[start:end]]
+        centroid = points.mean(axis=0)
+        radius = reduced_norm(points - centroid, self.metric, self.p).max()
+        return centroid, to_distance(radius, self.geometry, self.p)
+
+    def store_bounds(self, bounds):
+        """Store centroids in an array of shape (n_nodes, n_features) and radii in an
+        array of shape (n_nodes,).
+
+        :param list bounds: centroid and radius of the ball of each node.
+        """
+        self.centroid = np.array([b[0] for b in bounds])
+        self.radius = np.array([b[1] for b in bounds])
+
+    def min_distance(self, node, x):
+        """Calculate reduced distance between a point and the ball of nodes.
+
+        :param list node: node ids.
+        :param numpy.ndarray x: query point.
+        :return: (*numpy.ndarray*) -- reduced distances, 0 if the point is inside the
+            ball.
+        """
+        distance = reduced_norm(x - self.centroid[node], self.metric, self.p)
+        gap = to_distance(distance, self.geometry, self.p) - self.radius[node]
+        return from_distance(np.maximum(gap, 0), self.geometry, self.p)
+
+
+class RandomProjectionTree(SpatialTree):
+    """Random projection tree. Each node is split by a hyperplane orthogonal to a
+    random direction passing through the median of the projected training examples.
+    Nodes have no bounding volume, the tree is only used to find training examples
+    lying in the same region as a query point.
+
+    :param numpy.ndarray data: training examples.
+    :param int leaf_size: maximum number of training examples in a leaf.
+    :param numpy.random.Generator rng: random number generator.
+    """
+
+    def __init__(self, data, leaf_size=30, rng=None):
+        self.rng = np.random.default_rng(rng)
+        super().__init__(data, leaf_size=leaf_size)
+
+    def split(self, points):
+        """Project training examples of a node on a random direction.
+
+        :param numpy.ndarray points: training examples of the node.
+        :return: (*tuple*) -- projection of the training examples and normal of the
+            hyperplane.
+        """
+        normal = self.rng.standard_normal(points.shape[1])
+        return points @ normal, normal
+
+    def store_splits(self, direction):
+        """Store normal of the hyperplane splitting each node in an array of shape
+        (n_nodes, n_features), null vector for leaves.
+
+        :param list direction: normal of the hyperplane of each node, None for leaves.
+        """
+        zero = np.zeros(self.data.shape[1])
+        self.normal = np.array([zero if d is None else d for d in direction])
+
+    def bound(self, start, end):
+        """Nodes have no bounding volume.
+
+        :param int start: first position of the node in ``index``.
+        :param int end: last position (excluded) of the node in ``index``.
+        """
+        return None
+
+    def store_bounds(self, bounds):
+        """Nodes have no bounding volume.
+
+        :param list bounds: bounding volume of each node.
+        """
+        pass
+
+
+class RandomProjectionForest:
+    """Approximate nearest neighbors search using a forest of random projection
+    trees. A query point descends every tree down to a leaf and the exact distance is
+    only calculated for the training examples found in these leaves, the candidates.
+    Recall increases with the number of trees and the size of the leaves, at the
+    expense of latency.
+
+    Trees are merged in flat arrays once built: node ids are offset so that all
+    trees share the ``normal``, ``split_value``, ``left`` and ``right`` arrays and
+    queries descend all trees at once for a block of test examples.
+
+    :param numpy.ndarray data: training examples, array of shape (n_samples,
+        n_features).
+    :param int n_trees: number of trees.
+    :param int leaf_size: maximum number of training examples in a leaf. The number
+        of candidates per query is at most ``n_trees`` times ``leaf_size``.
+    :param int memory_budget: maximum number of bytes used by the features of the
+        candidates of a block of test examples. Test examples are processed in blocks
+        fitting in this budget. Gathering the candidates is memory bound, the default
+        budget keeps a block in cache.
+    :param int/numpy.random.Generator random_state: seed of the random directions.
+    :param str metric: name of the metric used to rank candidates.
+    :param float p: power of the minkowski metric.
+    """
+
+    def __init__(
+        self,
+        data,
+        n_trees=10,
+        leaf_size=30,
+        random_state=None,
+        memory_budget=2**22,
+        metric="euclidean",
+        p=2,
+    ):
+        self.data = data
+        self.metric = metric
+        self.p = p
+        self.n_trees = n_trees
+        self.leaf_size = leaf_size
+        self.memory_budget = memory_budget
+        self.sq_norm = np.einsum("ij,ij->i", data, data)
+        rng = np.random.default_rng(random_state)
+        self.merge([RandomProjectionTree(data, leaf_size, rng) for _ in range(n_trees)])
+
+    def merge(self, trees):
+        """Merge trees in flat arrays. Leaves are numbered and the training examples of
+        each leaf are stored in a row of ``leaf``, padded with -1.
+
+        :param list trees: random projection trees.
+        """
+        offset = np.cumsum([0] + [len(t.left) for t in trees])
+        self.root = offset[:-1]
+        self.normal = np.concatenate([t.normal for t in trees])
+        self.split_value = np.concatenate([t.split_value for t in trees])
+        self.left = np.concatenate(
+            [np.where(t.left == -1, -1, t.left + o) for t, o in zip(trees, offset)]
+        )
+        self.right = np.concatenate(
+            [np.where(t.right == -1, -1, t.right + o) for t, o in zip(trees, offset)]
+        )
+
+        size = max((t.end - t.start)[t.left == -1].max() for t in trees)
+        self.leaf_id = np.full(len(self.left), -1, dtype=np.intp)
+        self.leaf_id[self.left == -1] = np.arange((self.left == -1).sum())
+        self.leaf = np.full(((self.left == -1).sum(), size), -1, dtype=np.intp)
+        for t, o in zip(trees, offset):
+            for node in np.flatnonzero(t.left == -1):
+                id = t.index[t.start[node] : t.end[node]]
+                self.leaf[self.leaf_id[node + o], : len(id)] = id
+
+    def query(self, x_test, k, first=0):
+        """Find approximate k-nearest training examples of each test example. When
+        fewer than k candidates are found, missing neighbors have index -1 and infinite
+        distance.
+
+        :param numpy.ndarray x_test: test examples, array of shape (n_test,
+            n_features).
+        :param int k: number of neighbors.
+        :param int first: training examples with a lower index are skipped, e.g.
+            evicted ones.
+        :return: (*tuple*) -- distances and indices of the closest candidates, both
+            arrays of shape (n_test, k) sorted by increasing distance.
+        """
+        k = min(k, len(self.data))
+        distance = np.empty((len(x_test), k))
+        index = np.empty((len(x_test), k), dtype=np.intp)
+        n_candidates = self.n_trees * self.leaf.shape[1]
+        size = max(1, self.memory_budget // (8 * n_candidates * self.data.shape[1]))
+        for i in range(0, len(x_test), size):
+            block = slice(i, i + size)
+            distance[block], index[block] = self._query(x_test[block], k, first)
+        return to_distance(distance, self.metric, self.p), index
+
+    def candidates(self, x):
+        """Find training examples located in the same leaves than test examples.
+
+        :param numpy.ndarray x: block of test examples.
+        :return: (*numpy.ndarray*) -- array of shape (n_test, n_candidates) giving the
+            indices of the candidates, sorted, duplicates and padding set to -1.
+        """
+        node = np.tile(self.root, (len(x), 1))
+        inner = self.left[node] != -1
+        while inner.any():
+            n = node[inner]
+            margin = np.einsum("ij,ij->i", self.normal[n], x[np.nonzero(inner)[0]])
+            node[inner] = np.where(
+                margin < self.split_value[n], self.left[n], self.right[n]
+            )
+            inner = self.left[node] != -1
+
+        candidate = np.sort(self.leaf[self.leaf_id[node]].reshape(len(x), -1), axis=1)
+        candidate[:, 1:][candidate[:, 1:] == candidate[:, :-1]] = -1
+        return candidate
+
+    def _query(self, x, k, first=0):
+        """Rank candidates of a block of test examples using their exact distance.
+
+        :param numpy.ndarray x: block of test examples.
+        :param int k: number of neighbors.
+        :param int first: training examples with a lower index are skipped.
+        :return: (*tuple*) -- reduced distances and indices of the closest candidates
+            sorted by increasing distance.
+        """
+        candidate = self.candidates(x)
+        candidate[candidate < first] = -1
+        if candidate.shape[1] < k:
+            padding = np.full((len(x), k - candidate.shape[1]), -1, dtype=np.intp)
+            candidate = np.hstack((candidate, padding))
+        distance = candidate_distance(
+            x, self.data[candidate], self.metric, self.p, self.sq_norm[candidate]
+        )
+        distance[candidate == -1] = np.inf
+
+        id = np.argpartition(distance, k - 1, axis=1)[:, :k]
+        distance = np.take_along_axis(distance, id, axis=1)
+        order = np.argsort(distance, axis=1)
+        return (
+            np.take_along_axis(distance, order, axis=1),
+            np.take_along_axis(
+                np.take_along_axis(candidate, id, axis=1), order, axis=1
+            ),
+        )
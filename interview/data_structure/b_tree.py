@@ -0,0 +1,236 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class Leaf:
+    """Leaf of B+tree. Each leaf has three different fields, '*keys*' the sorted keys
+    in an :mod:`array`, '*values*' the values associated with the keys, None until
+    the tree is used as a map, and '*next*' the following leaf.
+    """
+
+    __slots__ = ("keys", "values", "next")
+
+    def __init__(self, keys, values=None):
+        self.keys = keys
+        self.values = values
+        self.next = None
+
+
+class Internal:
+    """Internal node of B+tree. Each node has two different fields, '*keys*' the
+    separators in an :mod:`array` and '*children*' the child nodes. The keys of ``children[i]`` are lower
+    than ``keys[i]``, which is the smallest key of ``children[i + 1]``.
+    """
+
+    __slots__ = ("keys", "children")
+
+    def __init__(self, keys, children):
+        self.keys = keys
+        self.children = children
+
+
+class BPlusTree:
+    """Ordered map of numbers as a B+tree. Keys are stored in leaves, in sorted
+    arrays of numbers searched by bisection, and leaves are linked in order. Internal
+    nodes only route searches. Nodes hold up to ``order`` keys, hence the height of
+    the tree is O(log(N)/log(order)) and insertion and lookup take O(log(N)) time
+    with few nodes visited. A key takes a few bytes instead of a Python object, and
+    lists of values are only allocated once a value is assigned with ``tree[key]``.
+    The tree has the same interface as
+    :class:`interview.data_structure.binary_search_tree.BinarySearchTree`.
+
+    :param int order: maximum number of keys of a node.
+    :param str typecode: type code of the keys, see :mod:`array`, e.g. *'q'* for 64
+        bits integers or *'d'* for floats.
+    :raises ValueError: if ``order`` is lower than 3.
+    """
+
+    def __init__(self, order=64, typecode="q"):
+        if order < 3:
+            raise ValueError("order must be greater or equal to 3")
+        self.order = order
+        self.typecode = typecode
+        self.root = Leaf(array(typecode))
+        self.head = self.root
+        self.count = 0
+        self.mapping = False
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """Visit keys in order, following links between leaves.
+
+        :return: (*generator*) -- keys.
+        """
+        leaf = self.head
+        while leaf is not None:
+            yield from leaf.keys
+            leaf = leaf.next
+
+    def __getitem__(self, key):
+        leaf = self.find(key)
+        i = bisect_left(leaf.keys, key)
+        if i == len(leaf.keys) or leaf.keys[i] != key:
+            raise KeyError(key)
+        return None if leaf.values is None else leaf.values[i]
+
+    def __setitem__(self, key, value):
+        if not self.mapping:
+            self.allocate_values()
+        self._insert(key, value)
+
+    def allocate_values(self):
+        """Allocate lists of values of the leaves, keys inserted so far are associated
+        with None.
+        """
+        leaf = self.head
+        while leaf is not None:
+            leaf.values = [None] * len(leaf.keys)
+            leaf = leaf.next
+        self.mapping = True
+
+    def insert(self, data):
+        """Insert key(s) in tree, associated with None.
+
+        :param int/float/list/tuple/set data: key(s) to insert in tree.
+        """
+        if isinstance(data, (int, float)):
+            data = [data]
+
+        for d in data:
+            self._insert(d, None)
+
+    def _insert(self, key, value):
+        """Insert key in tree or update its value. Full nodes are split in two halves
+        from the leaf up to the root, the smallest key of the right half is inserted
+        in the parent.
+
+        :param int key: key.
+        :param object value: value associated with the key.
+        """
+        path = []
+        node = self.root
+        while isinstance(node, Internal):
+            i = bisect_right(node.keys, key)
+            path.append((node, i))
+            node = node.children[i]
+
+        i = bisect_left(node.keys, key)
+        if i < len(node.keys) and node.keys[i] == key:
+            if self.mapping:
+                node.values[i] = value
+            return
+        node.keys.insert(i, key)
+        if self.mapping:
+            node.values.insert(i, value)
+        self.count += 1
+        if len(node.keys) <= self.order:
+            return
+
+        mid = len(node.keys) // 2
+        right = Leaf(node.keys[mid:], node.values[mid:] if self.mapping else None)
+        del node.keys[mid:]
+        if self.mapping:
+            del node.values[mid:]
+        right.next, node.next = node.next, right
+        separator = right.keys[0]
+
+        while path:
+            parent, i = path.pop()
+            parent.keys.insert(i, separator)
+            parent.children.insert(i + 1, right)
+            if len(parent.keys) <= self.order:
+                return
+            mid = len(parent.keys) // 2
+            separator = parent.keys[mid]
+            right = Internal(parent.keys[mid + 1 :], parent.children[mid + 1 :])
+            del parent.keys[mid:], parent.children[mid + 1 :]
+            node = parent
+        self.root = Internal(array(self.typecode, [separator]), [node, right])
+
+    def find(self, key):
+        """Find the leaf where a key is or would be.
+
+        :param int key: key.
+        :return: (*Leaf*) -- leaf.
+        """
+        node = self.root
+        while isinstance(node, Internal):
+            node = node.children[bisect_right(node.keys, key)]
+        return node
+
+    def exist(self, value):
+        """Check if a key is in tree.
+
+        :param int value: key.
+        :return: (**bool**) -- is ``value`` in tree.
+        """
+        if self.count == 0:
+            print("Tree is empty")
+            return False
+
+        keys = self.find(value).keys
+        i = bisect_left(keys, value)
+        return i < len(keys) and keys[i] == value
+
+    def get(self, key, default=None):
+        """Get value associated with a key.
+
+        :param int key: key.
+        :param object default: value returned if key is not in tree.
+        :return: (*object*) -- value.
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def get_min(self):
+        """Return min key in tree"""
+        return self.head.keys[0]
+
+    def get_max(self):
+        """Return max key in tree"""
+        node = self.root
+        while isinstance(node, Internal):
+            node = node.children[-1]
+        return node.keys[-1]
+
+    def range(self, low, high):
+        """Visit keys between two bounds in order. The leaf of the lower bound is
+        found from the root, the following leaves are scanned.
+
+        :param int low: lower bound, included.
+        :param int high: upper bound, included.
+        :return: (*generator*) -- keys.
+        """
+        leaf = self.find(low)
+        i = bisect_left(leaf.keys, low)
+        while leaf is not None:
+            j = bisect_right(leaf.keys, high)
+            yield from leaf.keys[i:j]
+            if j < len(leaf.keys):
+                return
+            leaf, i = leaf.next, 0
+
+    def items(self):
+        """Visit keys and values in order.
+
+        :return: (*generator*) -- key and value pairs.
+        """
+        leaf = self.head
+        while leaf is not None:
+            if leaf.values is None:
+                yield from ((key, None) for key in leaf.keys)
+            else:
+                yield from zip(leaf.keys, leaf.values)
+            leaf = leaf.next
+
+    def in_order_traversal(self):
+        """Visit keys in order.
+
+        :return: (*list*) -- keys.
+        """
+        values = list(self)
+        return values if len(values) > 0 else print("Tree is empty")
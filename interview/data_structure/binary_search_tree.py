@@ -1,15 +1,22 @@
+from array import array
+
+
 class Node:
-    """Single element of binary search tree. Each node has three different fields,
+    """Single element of binary search tree. Each node has four different fields,
     '*data*' which acts as the key to be provided, '*left*' and '*right*' denominating
-    both children of the node.
+    both children of the node and '*size*' the number of nodes of the subtree rooted
+    at the node.
 
     :param str/int/float data: value of the node.
     """
 
+    __slots__ = ("data", "left", "right", "size")
+
     def __init__(self, data):
         self.data = data
         self.left = None
         self.right = None
+        self.size = 1
 
     def __repr__(self):
         return self.data
@@ -21,9 +28,106 @@ class BinarySearchTree:
     of its right child nodes.
     """
 
+    node_type = Node
+
     def __init__(self):
         self.root = None
 
+    def __len__(self):
+        return self.size(self.root)
+
+    def __iter__(self):
+        """Visit nodes in order, iteratively.
+
+        :return: (*generator*) -- nodes.
+        """
+        return self._in_order_traversal(self.root)
+
+    def build(self, data):
+        """Build perfectly balanced tree from values, replacing its nodes. Values are
+        sorted unless they already are. Time complexity is O(N) for sorted values and
+        O(Nlog(N)) otherwise.
+
+        :param iterable data: values of nodes.
+        """
+        self.root = self.balanced(self.sorted_values(data))
+
+    def merge(self, data):
+        """Insert values in bulk: values of tree and new values are merged and the tree
+        is rebuilt perfectly balanced. Time complexity is O(N + M) for M sorted
+        values, cheaper than M insertions when M is not small compared to N.
+
+        :param iterable data: values of nodes to insert in tree.
+        """
+        new = self.sorted_values(data)
+        values = []
+        i = 0
+        for node in self:
+            while i < len(new) and new[i] < node.data:
+                values.append(new[i])
+                i += 1
+            if i < len(new) and new[i] == node.data:
+                i += 1
+            values.append(node.data)
+        values.extend(new[i:])
+        self.root = self.balanced(values)
+
+    def balanced(self, values):
+        """Build perfectly balanced subtree: the middle value is the root, values on
+        its left and right form its left and right branches. Nodes are linked
+        iteratively, children first. Time complexity is O(N).
+
+        :param list values: sorted distinct values.
+        :return: (*Node*) -- root of subtree.
+        """
+        if not values:
+            return None
+        nodes = [self.node_type(v) for v in values]
+        stack = [(0, len(values) - 1, False)]
+        while stack:
+            low, high, linked = stack.pop()
+            mid = (low + high) // 2
+            if not linked:
+                stack.append((low, high, True))
+                if mid < high:
+                    stack.append((mid + 1, high, False))
+                if low < mid:
+                    stack.append((low, mid - 1, False))
+                continue
+            node = nodes[mid]
+            node.left = nodes[(low + mid - 1) // 2] if low < mid else None
+            node.right = nodes[(mid + 1 + high) // 2] if mid < high else None
+            self.update(node)
+        return nodes[(len(values) - 1) // 2]
+
+    @staticmethod
+    def sorted_values(data):
+        """Sort values, in O(N) if they already are, and remove duplicates.
+
+        :param iterable data: values.
+        :return: (*list*) -- sorted distinct values.
+        """
+        values = list(data)
+        if any(values[i] > values[i + 1] for i in range(len(values) - 1)):
+            values.sort()
+        return [v for i, v in enumerate(values) if i == 0 or values[i - 1] != v]
+
+    def update(self, node):
+        """Update size of node from the sizes of its children.
+
+        :param Node node: node.
+        """
+        node.size = 1 + self.size(node.left) + self.size(node.right)
+
+    @staticmethod
+    def size(node):
+        """Get size of subtree.
+
+        :param Node node: root of subtree.
+        :return: (*int*) -- number of nodes, 0 for an empty subtree.
+        """
+        return 0 if node is None else node.size
+
     def insert(self, data):
         """Insert node(s) in tree.
 
@@ -36,20 +140,29 @@ class BinarySearchTree:
             self.root = self._insert(self.root, d)
 
     def _insert(self, node, data):
-        """Insert node in tree.
+        """Insert node in subtree, iteratively. Nodes visited on the way down are
+        stacked and updated on the way up by :meth:`retrace`.
 
-        :param Node node: current node.
+        :param Node node: root of subtree.
         :param int data: value of the node to be added to tree.
-        :return: (*Node*) -- inserted node.
+        :return: (*Node*) -- root of subtree.
         """
-        if node is None:
-            node = Node(data)
-        elif node.data > data:
-            node.left = self._insert(node.left, data)
-        elif node.data < data:
-            node.right = self._insert(node.right, data)
-
-        return node
+        path = []
+        current = node
+        while current is not None:
+            if current.data == data:
+                return node
+            path.append(current)
+            current = current.left if current.data > data else current.right
+
+        leaf = self.node_type(data)
+        if not path:
+            return leaf
+        if path[-1].data > data:
+            path[-1].left = leaf
+        else:
+            path[-1].right = leaf
+        return self.retrace(path)
 
     def exist(self, value):
         """Check if a value is in tree.
@@ -64,19 +177,100 @@ class BinarySearchTree:
         return self._exist(self.root, value)
 
     def _exist(self, node, data):
-        """Check if value is in Tree
+        """Check if value is in subtree, iteratively.
 
-        :param Node node: current node.
+        :param Node node: root of subtree.
         :param int data: value of the node to look for.
+        :return: (*bool*) -- is ``data`` in subtree.
         """
-        if node is None:
-            return False
-        elif node.data == data:
-            return True
-        elif node.data > data:
-            return self._exist(node.left, data)
+        while node is not None:
+            if node.data == data:
+                return True
+            node = node.left if node.data > data else node.right
+        return False
+
+    def delete(self, data):
+        """Delete node from tree, iteratively. A node with two children takes the
+        value of its successor, the smallest value of its right branch, whose node is
+        deleted instead (Hibbard deletion).
+
+        :param int data: value of the node to delete.
+        :raises ValueError: if value is not in tree.
+        """
+        path = []
+        current = self.root
+        while current is not None and current.data != data:
+            path.append(current)
+            current = current.left if current.data > data else current.right
+        if current is None:
+            raise ValueError(f"{data} is not in tree")
+
+        if current.left is not None and current.right is not None:
+            path.append(current)
+            successor = current.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            current.data = successor.data
+            current = successor
+        self.unlink(path, current)
+
+    def pop_min(self):
+        """Delete min value from tree.
+
+        :return: (*int*) -- min value.
+        :raises ValueError: if tree is empty.
+        """
+        if self.root is None:
+            raise ValueError("Tree is empty")
+        path, current = [], self.root
+        while current.left is not None:
+            path.append(current)
+            current = current.left
+        self.unlink(path, current)
+        return current.data
+
+    def pop_max(self):
+        """Delete max value from tree.
+
+        :return: (*int*) -- max value.
+        :raises ValueError: if tree is empty.
+        """
+        if self.root is None:
+            raise ValueError("Tree is empty")
+        path, current = [], self.root
+        while current.right is not None:
+            path.append(current)
+            current = current.right
+        self.unlink(path, current)
+        return current.data
+
+    def unlink(self, path, node):
+        """Replace node having at most one child by this child.
+
+        :param list path: nodes from the root to the parent of node.
+        :param Node node: node to remove.
+        """
+        child = node.left if node.left is not None else node.right
+        if not path:
+            self.root = child
+            return
+        if path[-1].left is node:
+            path[-1].left = child
         else:
-            return self._exist(node.right, data)
+            path[-1].right = child
+        self.root = self.retrace(path)
+
+    def retrace(self, path):
+        """Update nodes from bottom to top after an insertion or a deletion.
+
+        :param list path: nodes from the root of a subtree to the parent of the
+            inserted or deleted node.
+        :return: (*Node*) -- root of subtree.
+        """
+        for node in reversed(path):
+            self.update(node)
+        return path[0]
 
     def get_min(self):
         """Return min value in tree"""
@@ -86,7 +280,7 @@ class BinarySearchTree:
         return current.data
 
     def get_max(self):
-        """Return min value in tree"""
+        """Return max value in tree"""
         current = self.root
         while current.right:
             current = current.right
@@ -97,66 +291,614 @@ class BinarySearchTree:
 
         :return: (*list*) -- values of nodes.
         """
-        return self._in_order_traversal(self.root)
+        values = [node.data for node in self._in_order_traversal(self.root)]
+        return values if len(values) > 0 else print("Tree is empty")
 
     def pre_order_traversal(self):
         """Visit current node, then left branch, and finally right branch.
 
         :return: (*list*) -- values of nodes.
         """
-        return self._pre_order_traversal(self.root)
+        values = [node.data for node in self._pre_order_traversal(self.root)]
+        return values if len(values) > 0 else print("Tree is empty")
 
     def post_order_traversal(self):
         """Visit left branch, then right branch, and finally current node.
 
         :return: (*list*) -- values of nodes.
         """
-        return self._post_order_traversal(self.root)
+        values = [node.data for node in self._post_order_traversal(self.root)]
+        return values if len(values) > 0 else print("Tree is empty")
 
     def _in_order_traversal(self, node):
         """Visit left branch, then the current node, and finally the right branch.
+        Iterative, memory used is O(h) where h is the height of the subtree.
 
-        :param Node node: current node.
-        :return: (*list*) -- values of nodes.
+        :param Node node: root of subtree.
+        :return: (*generator*) -- nodes.
         """
-        values = []
-        if node.left:
-            values += self._in_order_traversal(node.left)
-        if node.data:
-            values.append(node.data)
-        if node.right:
-            values += self._in_order_traversal(node.right)
+        stack = []
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
+
+    def _pre_order_traversal(self, node):
+        """Visit current node, then left branch, and finally right branch. Iterative,
+        memory used is O(h) where h is the height of the subtree.
+
+        :param Node node: root of subtree.
+        :return: (*generator*) -- nodes.
+        """
+        stack = [] if node is None else [node]
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+
+    def _post_order_traversal(self, node):
+        """Visit left branch, then right branch, and finally current node. Iterative,
+        memory used is O(h) where h is the height of the subtree.
+
+        :param Node node: root of subtree.
+        :return: (*generator*) -- nodes.
+        """
+        stack, last = [], None
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node.left
+            elif stack[-1].right is not None and stack[-1].right is not last:
+                node = stack[-1].right
+            else:
+                last = stack.pop()
+                yield last
+
+    def range(self, low, high):
+        """Visit values between two bounds in order. Branches out of bounds are not
+        visited, time complexity is O(h + M) for M values, where h is the height of
+        the tree.
+
+        :param int low: lower bound, included.
+        :param int high: upper bound, included.
+        :return: (*generator*) -- values.
+        """
+        stack, node = [], self.root
+        while stack or node is not None:
+            while node is not None:
+                if node.data < low:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if node.data > high:
+                return
+            yield node.data
+            node = node.right
+
+    def floor(self, value):
+        """Find the greatest value lower or equal to a value.
+
+        :param int value: value.
+        :return: (*int*) -- value in tree, None if all values are greater.
+        """
+        node, best = self.root, None
+        while node is not None:
+            if node.data == value:
+                return node.data
+            elif node.data < value:
+                best, node = node.data, node.right
+            else:
+                node = node.left
+        return best
+
+    def ceiling(self, value):
+        """Find the smallest value greater or equal to a value.
+
+        :param int value: value.
+        :return: (*int*) -- value in tree, None if all values are lower.
+        """
+        node, best = self.root, None
+        while node is not None:
+            if node.data == value:
+                return node.data
+            elif node.data > value:
+                best, node = node.data, node.left
+            else:
+                node = node.right
+        return best
+
+    def successor(self, value):
+        """Find the smallest value strictly greater than a value.
+
+        :param int value: value, not necessarily in tree.
+        :return: (*int*) -- value in tree, None if all values are lower or equal.
+        """
+        node, best = self.root, None
+        while node is not None:
+            if node.data > value:
+                best, node = node.data, node.left
+            else:
+                node = node.right
+        return best
+
+    def rank(self, value):
+        """Count values lower than a value. Time complexity is O(h), where h is the
+        height of the tree.
+
+        :param int value: value, not necessarily in tree.
+        :return: (*int*) -- number of values lower than ``value``.
+        """
+        node, count = self.root, 0
+        while node is not None:
+            if node.data < value:
+                count += 1 + self.size(node.left)
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def select(self, i):
+        """Find the i-th smallest value. Time complexity is O(h), where h is the
+        height of the tree.
+
+        :param int i: rank of the value, starting at 0.
+        :return: (*int*) -- value.
+        :raises IndexError: if ``i`` is out of range.
+        """
+        if not 0 <= i < len(self):
+            raise IndexError(f"rank is out of range. Tree has {len(self)} values")
+        node = self.root
+        while True:
+            left = self.size(node.left)
+            if i < left:
+                node = node.left
+            elif i > left:
+                i -= left + 1
+                node = node.right
+            else:
+                return node.data
+
+
+class AVLNode(Node):
+    """Node of AVL tree. In addition to the fields of :class:`Node`, '*height*' is
+    the height of the subtree rooted at the node.
+
+    :param str/int/float data: value of the node.
+    """
+
+    __slots__ = ("height",)
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.height = 1
+
+
+class AVLTree(BinarySearchTree):
+    """Self-balancing binary search tree. The heights of the two branches of each node
+    differ by at most one, hence the height of the tree is O(log(N)) and insertion,
+    deletion and lookup take O(log(N)) time, even when values are inserted in order.
+    Nodes visited on the way down by insertion and deletion are rebalanced by
+    rotations on the way up.
+    """
+
+    node_type = AVLNode
+
+    def retrace(self, path):
+        """Rebalance nodes from bottom to top after an insertion or a deletion.
+
+        :param list path: nodes from the root of a subtree to the parent of the
+            inserted or deleted node.
+        :return: (*AVLNode*) -- root of subtree.
+        """
+        for i in range(len(path) - 1, -1, -1):
+            node = self.rebalance(path[i])
+            if i > 0:
+                if path[i - 1].left is path[i]:
+                    path[i - 1].left = node
+                else:
+                    path[i - 1].right = node
+        return node
 
+    def rebalance(self, node):
+        """Update height of node and rotate its subtree if its branches are
+        unbalanced.
+
+        :param AVLNode node: node whose branches are balanced.
+        :return: (*AVLNode*) -- root of subtree.
+        """
+        self.update(node)
+        balance = self.height(node.left) - self.height(node.right)
+        if balance > 1:
+            if self.height(node.left.left) < self.height(node.left.right):
+                node.left = self.rotate_left(node.left)
+            return self.rotate_right(node)
+        elif balance < -1:
+            if self.height(node.right.right) < self.height(node.right.left):
+                node.right = self.rotate_right(node.right)
+            return self.rotate_left(node)
+        return node
+
+    def rotate_left(self, node):
+        """Rotate subtree to the left: the right child of node becomes the root.
+
+        :param AVLNode node: root of subtree.
+        :return: (*AVLNode*) -- new root of subtree.
+        """
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self.update(node)
+        self.update(pivot)
+        return pivot
+
+    def rotate_right(self, node):
+        """Rotate subtree to the right: the left child of node becomes the root.
+
+        :param AVLNode node: root of subtree.
+        :return: (*AVLNode*) -- new root of subtree.
+        """
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self.update(node)
+        self.update(pivot)
+        return pivot
+
+    def update(self, node):
+        """Update height and size of node from the heights and sizes of its children.
+
+        :param AVLNode node: node.
+        """
+        super().update(node)
+        node.height = 1 + max(self.height(node.left), self.height(node.right))
+
+    @staticmethod
+    def height(node):
+        """Get height of subtree.
+
+        :param AVLNode node: root of subtree.
+        :return: (*int*) -- height, 0 for an empty subtree.
+        """
+        return 0 if node is None else node.height
+
+
+class CompactBinarySearchTree:
+    """AVL tree of numbers stored as a struct of arrays. Node *i* is described by the
+    *i*-th element of four columns: '*key*', the value of the node, '*left*' and
+    '*right*', indices of its children (-1 for none), and '*height*', the height of
+    its subtree. A node takes 17 bytes for 64 bits keys, nodes of a subtree built in
+    bulk are contiguous. Slots of deleted nodes are chained in a free list through
+    the '*left*' column and reused by later insertions.
+
+    :param str typecode: type code of the keys, see :mod:`array`, e.g. *'q'* for 64
+        bits integers or *'d'* for floats.
+    """
+
+    def __init__(self, typecode="q"):
+        self.key = array(typecode)
+        self.left = array("i")
+        self.right = array("i")
+        self.height = array("b")
+        self.root = -1
+        self.free = -1
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """Visit keys in order, iteratively.
+
+        :return: (*generator*) -- keys.
+        """
+        stack, i = [], self.root
+        while stack or i != -1:
+            while i != -1:
+                stack.append(i)
+                i = self.left[i]
+            i = stack.pop()
+            yield self.key[i]
+            i = self.right[i]
+
+    def insert(self, data):
+        """Insert node(s) in tree.
+
+        :param int/float/list/tuple/set data: value(s) of nodes to insert in tree.
+        """
+        if isinstance(data, (int, float)):
+            data = [data]
+
+        for d in data:
+            self._insert(d)
+
+    def _insert(self, data):
+        """Insert node in tree and rebalance the nodes on the path to it.
+
+        :param int/float data: value of the node to be added to tree.
+        """
+        key, left, right = self.key, self.left, self.right
+        path = []
+        i = self.root
+        while i != -1:
+            if key[i] == data:
+                return
+            path.append(i)
+            i = left[i] if key[i] > data else right[i]
+
+        leaf = self.allocate(data)
+        if not path:
+            self.root = leaf
+            return
+        if key[path[-1]] > data:
+            left[path[-1]] = leaf
+        else:
+            right[path[-1]] = leaf
+        self.root = self.retrace(path)
+
+    def build(self, data):
+        """Build perfectly balanced tree from values, replacing its nodes. Nodes are
+        stored in order of their keys. Time complexity is O(N) for sorted values and
+        O(Nlog(N)) otherwise.
+
+        :param iterable data: values of nodes.
+        """
+        values = BinarySearchTree.sorted_values(data)
+        n = len(values)
+        self.key = array(self.key.typecode, values)
+        self.left = array("i", [-1]) * n
+        self.right = array("i", [-1]) * n
+        self.height = array("b", [0]) * n
+        self.free, self.count = -1, n
+        self.root = (n - 1) // 2 if n > 0 else -1
+
+        stack = [(0, n - 1)] if n > 0 else []
+        while stack:
+            low, high = stack.pop()
+            mid = (low + high) // 2
+            self.height[mid] = (high - low + 1).bit_length()
+            if low < mid:
+                self.left[mid] = (low + mid - 1) // 2
+                stack.append((low, mid - 1))
+            if mid < high:
+                self.right[mid] = (mid + 1 + high) // 2
+                stack.append((mid + 1, high))
+
+    def exist(self, value):
+        """Check if a value is in tree.
+
+        :param int/float value: value of the node.
+        :return: (**bool**) -- is ``value`` in tree.
+        """
+        if self.root == -1:
+            print("Tree is empty")
+            return False
+
+        key, left, right = self.key, self.left, self.right
+        i = self.root
+        while i != -1:
+            if key[i] == value:
+                return True
+            i = left[i] if key[i] > value else right[i]
+        return False
+
+    def delete(self, data):
+        """Delete node from tree. A node with two children takes the value of its
+        successor, whose node is deleted instead. The slot of the deleted node is
+        added to the free list.
+
+        :param int/float data: value of the node to delete.
+        :raises ValueError: if value is not in tree.
+        """
+        key, left, right = self.key, self.left, self.right
+        path = []
+        i = self.root
+        while i != -1 and key[i] != data:
+            path.append(i)
+            i = left[i] if key[i] > data else right[i]
+        if i == -1:
+            raise ValueError(f"{data} is not in tree")
+
+        if left[i] != -1 and right[i] != -1:
+            path.append(i)
+            successor = right[i]
+            while left[successor] != -1:
+                path.append(successor)
+                successor = left[successor]
+            key[i] = key[successor]
+            i = successor
+
+        child = left[i] if left[i] != -1 else right[i]
+        self.release(i)
+        if not path:
+            self.root = child
+            return
+        if left[path[-1]] == i:
+            left[path[-1]] = child
+        else:
+            right[path[-1]] = child
+        self.root = self.retrace(path)
+
+    def get_min(self):
+        """Return min value in tree
+
+        :raises ValueError: if tree is empty.
+        """
+        if self.root == -1:
+            raise ValueError("Tree is empty")
+        i = self.root
+        while self.left[i] != -1:
+            i = self.left[i]
+        return self.key[i]
+
+    def get_max(self):
+        """Return max value in tree
+
+        :raises ValueError: if tree is empty.
+        """
+        if self.root == -1:
+            raise ValueError("Tree is empty")
+        i = self.root
+        while self.right[i] != -1:
+            i = self.right[i]
+        return self.key[i]
+
+    def in_order_traversal(self):
+        """Visit left branch, then the current node, and finally the right branch.
+
+        :return: (*list*) -- values of nodes.
+        """
+        values = list(self)
         return values if len(values) > 0 else print("Tree is empty")
 
-    def _pre_order_traversal(self, node):
+    def pre_order_traversal(self):
         """Visit current node, then left branch, and finally right branch.
 
-        :param Node node: current node.
         :return: (*list*) -- values of nodes.
         """
         values = []
-        if node.data:
-            values.append(node.data)
-        if node.left:
-            values += self._pre_order_traversal(node.left)
-        if node.right:
-            values += self._pre_order_traversal(node.right)
-
+        stack = [self.root] if self.root != -1 else []
+        while stack:
+            i = stack.pop()
+            values.append(self.key[i])
+            if self.right[i] != -1:
+                stack.append(self.right[i])
+            if self.left[i] != -1:
+                stack.append(self.left[i])
         return values if len(values) > 0 else print("Tree is empty")
 
-    def _post_order_traversal(self, node):
+    def post_order_traversal(self):
         """Visit left branch, then right branch, and finally current node.
 
-        :param Node node: current node.
         :return: (*list*) -- values of nodes.
         """
+        # Reversed pre-order visiting the right branch first
         values = []
-        if node.left:
-            values += self._post_order_traversal(node.left)
-        if node.right:
-            values += self._post_order_traversal(node.right)
-        if node.data:
-            values.append(node.data)
-
+        stack = [self.root] if self.root != -1 else []
+        while stack:
+            i = stack.pop()
+            values.append(self.key[i])
+            if self.left[i] != -1:
+                stack.append(self.left[i])
+            if self.right[i] != -1:
+                stack.append(self.right[i])
+        values.reverse()
         return values if len(values) > 0 else print("Tree is empty")
+
+    def allocate(self, data):
+        """Store new leaf, in a slot of the free list if any.
+
+        :param int/float data: value of the node.
+        :return: (*int*) -- index of the node.
+        """
+        self.count += 1
+        if self.free == -1:
+            self.key.append(data)
+            self.left.append(-1)
+            self.right.append(-1)
+            self.height.append(1)
+            return len(self.key) - 1
+        i = self.free
+        self.free = self.left[i]
+        self.key[i], self.left[i], self.right[i], self.height[i] = data, -1, -1, 1
+        return i
+
+    def release(self, i):
+        """Add slot of a deleted node to the free list.
+
+        :param int i: index of the node.
+        """
+        self.count -= 1
+        self.left[i] = self.free
+        self.right[i] = -1
+        self.height[i] = 0
+        self.free = i
+
+    def retrace(self, path):
+        """Rebalance nodes from bottom to top after an insertion or a deletion.
+
+        :param list path: indices of the nodes from the root to the parent of the
+            inserted or deleted node.
+        :return: (*int*) -- index of the root.
+        """
+        left, right = self.left, self.right
+        for k in range(len(path) - 1, -1, -1):
+            i = self.rebalance(path[k])
+            if k > 0:
+                if left[path[k - 1]] == path[k]:
+                    left[path[k - 1]] = i
+                else:
+                    right[path[k - 1]] = i
+        return i
+
+    def rebalance(self, i):
+        """Update height of node and rotate its subtree if its branches are
+        unbalanced.
+
+        :param int i: index of the node.
+        :return: (*int*) -- index of the root of subtree.
+        """
+        left, right = self.left, self.right
+        self.update(i)
+        balance = self.get_height(left[i]) - self.get_height(right[i])
+        if balance > 1:
+            if self.get_height(left[left[i]]) < self.get_height(right[left[i]]):
+                left[i] = self.rotate_left(left[i])
+            return self.rotate_right(i)
+        elif balance < -1:
+            if self.get_height(right[right[i]]) < self.get_height(left[right[i]]):
+                right[i] = self.rotate_right(right[i])
+            return self.rotate_left(i)
+        return i
+
+    def rotate_left(self, i):
+        """Rotate subtree to the left: the right child of node becomes the root.
+
+        :param int i: index of the root of subtree.
+        :return: (*int*) -- index of the new root of subtree.
+        """
+        pivot = self.right[i]
+        self.right[i] = self.left[pivot]
+        self.left[pivot] = i
+        self.update(i)
+        self.update(pivot)
+        return pivot
+
+    def rotate_right(self, i):
+        """Rotate subtree to the right: the left child of node becomes the root.
+
+        :param int i: index of the root of subtree.
+        :return: (*int*) -- index of the new root of subtree.
+        """
+        pivot = self.left[i]
+        self.left[i] = self.right[pivot]
+        self.right[pivot] = i
+        self.update(i)
+        self.update(pivot)
+        return pivot
+
+    def update(self, i):
+        """Update height of node from the heights of its children.
+
+        :param int i: index of the node.
+        """
+        self.height[i] = 1 + max(
+            self.get_height(self.left[i]), self.get_height(self.right[i])
+        )
+
+    def get_height(self, i):
+        """Get height of subtree.
+
+        :param int i: index of the root of subtree.
+        :return: (*int*) -- height, 0 for an empty subtree.
+        """
+        return 0 if i == -1 else self.height[i]
@@ -1,3 +1,8 @@
+from array import array
+
+import numpy as np
+
+
 class Node:
     """Single element of linked list. Each node has two different fields, *'data'*
     containing the value to be stored in the node and *'next'* containing a reference
@@ -6,6 +11,8 @@ class Node:
     :param str/int/float data: value of the node.
     """
 
+    __slots__ = ("data", "next")
+
     def __init__(self, data):
         self.data = data
         self.next = None
@@ -16,11 +23,18 @@ class Node:
 
 class SinglyLinkedList:
     """Linked list as a collection of nodes. First element of the linked list is called
-    '*head*'.
+    '*head*' and last element '*tail*'. The number of elements is tracked in
+    '*size*', hence appending, getting the length and checking positions take O(1)
+    time.
     """
 
     def __init__(self):
         self.head = None
+        self.tail = None
+        self.size = 0
+
+    def __len__(self):
+        return self.size
 
     def create(self, data=None):
         """Create linked list with some elements.
@@ -28,8 +42,7 @@ class SinglyLinkedList:
         :param list data: initial element(s) to create linked list.
         """
         if data:
-            for d in data:
-                self.append(d)
+            self.extend(data)
 
     def append(self, data):
         """Add node at end of linked list.
@@ -37,12 +50,29 @@ class SinglyLinkedList:
         :param str/int/float data: value of the node to be added.
         """
         node = Node(data)
-        if self.head is None:
+        if self.tail is None:
             self.head = node
         else:
-            for n in self:
-                pass
-            n.next = node
+            self.tail.next = node
+        self.tail = node
+        self.size += 1
+
+    def extend(self, data):
+        """Add nodes at end of linked list, linked in one pass.
+
+        :param iterable data: values of the nodes to be added.
+        """
+        tail, count = self.tail, 0
+        for d in data:
+            node = Node(d)
+            if tail is None:
+                self.head = node
+            else:
+                tail.next = node
+            tail = node
+            count += 1
+        self.tail = tail
+        self.size += count
 
     def insert(self, data, position=None):
         """Add node to the linked list
@@ -52,23 +82,29 @@ class SinglyLinkedList:
             the node will be added at the end of the linked list.
         :raises ValueError: if ``position`` is incorrect.
         """
-        node = Node(data)
-        if position is None:
+        if position is None or (position == self.size and position > 0):
             self.append(data)
         elif position == 0:
+            node = Node(data)
             node.next = self.head
             self.head = node
+            if self.tail is None:
+                self.tail = node
+            self.size += 1
         elif self.head is None and position > 0:
             raise ValueError("position is out of range. Linked list is empty")
+        elif not 0 < position < self.size:
+            raise ValueError(
+                f"position is out of range. Linked list has {self.size} elements"
+            )
         else:
+            node = Node(data)
             for i, n in enumerate(self):
-                if n and i == (position - 1):
+                if i == (position - 1):
                     node.next = n.next
                     n.next = node
-                    return
-            raise ValueError(
-                f"position is out of range. Linked list has {i+1} elements"
-            )
+                    break
+            self.size += 1
 
     def remove(self, position):
         """Remove node in the linked list.
@@ -78,16 +114,22 @@ class SinglyLinkedList:
         """
         if self.head is None:
             raise ValueError("Linked list is empty")
+        elif not 0 <= position < self.size:
+            raise ValueError(
+                f"position is out of range. Linked list has {self.size} elements"
+            )
         elif position == 0:
             self.head = self.head.next
+            if self.head is None:
+                self.tail = None
         else:
             for i, n in enumerate(self):
-                if n.next and i == (position - 1):
+                if i == (position - 1):
                     n.next = n.next.next
-                    return
-            raise ValueError(
-                f"position is out of range. Linked list has {i+1} elements"
-            )
+                    if n.next is None:
+                        self.tail = n
+                    break
+        self.size -= 1
 
     def __repr__(self):
         node = self.head
@@ -103,3 +145,508 @@ class SinglyLinkedList:
         while node:
             yield node
             node = node.next
+
+
+class Block:
+    """Node of unrolled linked list. Each block has two different fields, *'data'*
+    containing a list of consecutive elements and *'next'* containing a reference to
+    the next block in the list.
+
+    :param list data: values of the elements.
+    """
+
+    __slots__ = ("data", "next")
+
+    def __init__(self, data):
+        self.data = data
+        self.next = None
+
+
+class BlockNode:
+    """Element of unrolled linked list seen as a node. *'data'* reads and assigns the
+    element in its block, *'next'* gives the following element, None for the last
+    one. Links are managed by the list and cannot be assigned.
+
+    :param Block block: block holding the element.
+    :param int offset: position of the element in the block.
+    """
+
+    __slots__ = ("block", "offset")
+
+    def __init__(self, block, offset):
+        self.block = block
+        self.offset = offset
+
+    @property
+    def data(self):
+        return self.block.data[self.offset]
+
+    @data.setter
+    def data(self, value):
+        self.block.data[self.offset] = value
+
+    @property
+    def next(self):
+        if self.offset + 1 < len(self.block.data):
+            return BlockNode(self.block, self.offset + 1)
+        return None if self.block.next is None else BlockNode(self.block.next, 0)
+
+    def __repr__(self):
+        return str(self.data)
+
+
+class UnrolledLinkedList:
+    """Linked list of blocks holding up to ``capacity`` elements each. A block more
+    than full is split in two halves, a block less than half full is merged with the
+    next one when both fit in three quarters of a block, so that a split is not
+    immediately undone by a merge. The list uses far fewer Python objects than one
+    node per element.
+
+    The capacity is doubled, and elements regrouped in full blocks, whenever the list
+    holds more than ``capacity**2`` elements. Hence there are O(√N) blocks of O(√N)
+    elements, and regrouping costs amortized O(1) time per element added.
+
+    With ``index``, blocks are also kept in a list along with a NumPy array of the
+    positions of their first elements, used as a skip index: the block of a position
+    is found by binary search in O(log(N)) time, and changes of the sizes of blocks
+    shift the following positions in a single vectorized operation. Positional
+    access, insertion and deletion then take O(√N) time, dominated by the shift and
+    the update of the block list. Without it, finding a position walks the O(√N)
+    blocks.
+
+    :param int capacity: initial maximum number of elements of a block.
+    :param bool index: maintain skip index over the blocks.
+    :raises ValueError: if ``capacity`` is lower than 2.
+    """
+
+    def __init__(self, capacity=64, index=True):
+        if capacity < 2:
+            raise ValueError("capacity must be greater or equal to 2")
+        self.capacity = capacity
+        self.index = index
+        self.head = None
+        self.tail = None
+        self.size = 0
+        self.blocks = []
+        self.start = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return self.size
+
+    def create(self, data=None):
+        """Create linked list with some elements.
+
+        :param list data: initial element(s) to create linked list.
+        """
+        if data:
+            self.extend(data)
+
+    def append(self, data):
+        """Add element at end of linked list.
+
+        :param str/int/float data: value of the element to be added.
+        """
+        if self.tail is None or len(self.tail.data) == self.capacity:
+            self.link(Block([data]))
+        else:
+            self.tail.data.append(data)
+        self.size += 1
+        self.grow()
+
+    def extend(self, data):
+        """Add elements at end of linked list. The last block is filled and new full
+        blocks are linked.
+
+        :param iterable data: values of the elements to be added.
+        """
+        data = list(data)
+        start = 0
+        if self.tail is not None:
+            start = min(self.capacity - len(self.tail.data), len(data))
+            self.tail.data.extend(data[:start])
+        for i in range(start, len(data), self.capacity):
+            self.link(Block(data[i : i + self.capacity]), update=False)
+        if self.index:
+            first = self.size + np.arange(start, len(data), self.capacity)
+            self.start = np.concatenate((self.start, first))
+        self.size += len(data)
+        self.grow()
+
+    def insert(self, data, position=None):
+        """Add element to the linked list.
+
+        :param str/int/float data: value of the element to be inserted.
+        :param int position: position where the element will be inserted. If set to
+            None, the element will be added at the end of the linked list.
+        :raises ValueError: if ``position`` is incorrect.
+        """
+        if position is None or position == self.size:
+            self.append(data)
+            return
+        elif self.head is None and position > 0:
+            raise ValueError("position is out of range. Linked list is empty")
+        elif not 0 <= position < self.size:
+            raise ValueError(
+                f"position is out of range. Linked list has {self.size} elements"
+            )
+
+        _, block, k, offset = self.locate(position)
+        block.data.insert(offset, data)
+        self.size += 1
+        if self.index:
+            self.add(k, 1)
+        if len(block.data) > self.capacity:
+            half = Block(block.data[self.capacity // 2 :])
+            del block.data[self.capacity // 2 :]
+            half.next, block.next = block.next, half
+            if self.tail is block:
+                self.tail = half
+            if self.index:
+                self.blocks.insert(k + 1, half)
+                self.start = np.insert(
+                    self.start, k + 1, self.start[k] + len(block.data)
+                )
+        self.grow()
+
+    def remove(self, position):
+        """Remove element in the linked list.
+
+        :param int position: position of the element to remove.
+        :raises ValueError: if ``position`` is incorrect.
+        """
+        if self.head is None:
+            raise ValueError("Linked list is empty")
+        elif not 0 <= position < self.size:
+            raise ValueError(
+                f"position is out of range. Linked list has {self.size} elements"
+            )
+
+        previous, block, k, offset = self.locate(position)
+        del block.data[offset]
+        self.size -= 1
+        if self.index:
+            self.add(k, -1)
+
+        following = block.next
+        if not block.data:
+            self.unlink(previous, block, k)
+        elif (
+            following is not None
+            and len(block.data) < self.capacity // 2
+            and len(block.data) + len(following.data) <= 3 * self.capacity // 4
+        ):
+            block.data.extend(following.data)
+            self.unlink(block, following, k + 1)
+
+    def get(self, position):
+        """Get element of the linked list.
+
+        :param int position: position of the element.
+        :return: (*str/int/float*) -- value of the element.
+        :raises ValueError: if ``position`` is incorrect.
+        """
+        if not 0 <= position < self.size:
+            raise ValueError(
+                f"position is out of range. Linked list has {self.size} elements"
+            )
+        _, block, _, offset = self.locate(position)
+        return block.data[offset]
+
+    def locate(self, position):
+        """Find block holding the element at a position.
+
+        :param int position: position of the element.
+        :return: (*tuple*) -- previous block, block, index of the block and offset of
+            the element in the block.
+        """
+        if self.index:
+            k = int(np.searchsorted(self.start, position, side="right")) - 1
+            previous = self.blocks[k - 1] if k > 0 else None
+            return previous, self.blocks[k], k, position - int(self.start[k])
+
+        previous, block, k = None, self.head, 0
+        while position >= len(block.data):
+            position -= len(block.data)
+            previous, block, k = block, block.next, k + 1
+        return previous, block, k, position
+
+    def link(self, block, update=True):
+        """Link block at end of linked list.
+
+        :param Block block: block.
+        :param bool update: add position of the block to the skip index.
+        """
+        if self.tail is None:
+            self.head = block
+        else:
+            self.tail.next = block
+        self.tail = block
+        if self.index:
+            self.blocks.append(block)
+            if update:
+                self.start = np.append(self.start, self.size)
+
+    def unlink(self, previous, block, k):
+        """Unlink block from linked list.
+
+        :param Block previous: previous block, None if block is the head.
+        :param Block block: block.
+        :param int k: index of the block.
+        """
+        if previous is None:
+            self.head = block.next
+        else:
+            previous.next = block.next
+        if self.tail is block:
+            self.tail = previous
+        if self.index:
+            del self.blocks[k]
+            self.start = np.delete(self.start, k)
+
+    def add(self, k, delta):
+        """Update skip index after a change of the size of a block.
+
+        :param int k: index of the block.
+        :param int delta: change of size.
+        """
+        self.start[k + 1 :] += delta
+
+    def grow(self):
+        """Double capacity while the list holds more than ``capacity**2`` elements,
+        then regroup elements in full blocks and rebuild the skip index.
+        """
+        if self.size <= self.capacity**2:
+            return
+        while self.capacity**2 < 2 * self.size:
+            self.capacity *= 2
+        data = [d for block in self.iter_blocks() for d in block.data]
+        self.head, self.tail, self.size = None, None, 0
+        self.blocks, self.start = [], np.zeros(0, dtype=np.int64)
+        self.extend(data)
+
+    def __repr__(self):
+        nodes = [str(d) for block in self.iter_blocks() for d in block.data]
+        nodes.append("None")
+        return " -> ".join(nodes)
+
+    def __iter__(self):
+        for block in self.iter_blocks():
+            for offset in range(len(block.data)):
+                yield BlockNode(block, offset)
+
+    def iter_blocks(self):
+        """Visit blocks in order.
+
+        :return: (*generator*) -- blocks.
+        """
+        block = self.head
+        while block:
+            yield block
+            block = block.next
+
+
+class PooledNode:
+    """Node of pooled linked list seen through its slot. *'data'* reads and assigns
+    the value of the slot, *'next'* gives the following node, None for the last one.
+    Links are managed by the list and cannot be assigned.
+
+    :param PooledLinkedList pool: linked list holding the slot.
+    :param int slot: index of the slot.
+    """
+
+    __slots__ = ("pool", "slot")
+
+    def __init__(self, pool, slot):
+        self.pool = pool
+        self.slot = slot
+
+    @property
+    def data(self):
+        return self.pool.data[self.slot]
+
+    @data.setter
+    def data(self, value):
+        self.pool.data[self.slot] = value
+
+    @property
+    def next(self):
+        i = self.pool.next[self.slot]
+        return None if i == -1 else PooledNode(self.pool, i)
+
+    def __repr__(self):
+        return str(self.data)
+
+
+class PooledLinkedList:
+    """Linked list stored in a pool of slots instead of node objects. Slot *i* is
+    described by the *i*-th element of two columns: '*data*', the value of the node,
+    and '*next*', the index of the next node (-1 for none). Values are kept in a list,
+    or in an :mod:`array` of numbers when ``typecode`` is given, hence the garbage
+    collector tracks a few containers instead of one object per node. Slots of
+    removed nodes are chained in a free list through the '*next*' column and reused
+    by later insertions. '*head*' and '*tail*' are indices of the first and last
+    nodes.
+
+    :param str typecode: type code of the values, see :mod:`array`, e.g. *'q'* for 64
+        bits integers or *'d'* for floats. Any value can be stored if None.
+    """
+
+    def __init__(self, typecode=None):
+        self.data = [] if typecode is None else array(typecode)
+        self.next = array("i")
+        self.head = -1
+        self.tail = -1
+        self.size = 0
+        self.free = -1
+
+    def __len__(self):
+        return self.size
+
+    def create(self, data=None):
+        """Create linked list with some elements.
+
+        :param list data: initial element(s) to create linked list.
+        """
+        if data:
+            self.extend(data)
+
+    def append(self, data):
+        """Add node at end of linked list.
+
+        :param str/int/float data: value of the node to be added.
+        """
+        i = self.allocate(data)
+        if self.tail == -1:
+            self.head = i
+        else:
+            self.next[self.tail] = i
+        self.tail = i
+        self.size += 1
+
+    def extend(self, data):
+        """Add nodes at end of linked list. Without free slots, values are copied to
+        the end of the pool at once and linked to their neighbors.
+
+        :param iterable data: values of the nodes to be added.
+        """
+        if self.free != -1:
+            for d in data:
+                self.append(d)
+            return
+
+        start = len(self.next)
+        self.data.extend(data)
+        count = len(self.data) - start
+        if count == 0:
+            return
+        self.next.extend(range(start + 1, start + count + 1))
+        self.next[-1] = -1
+        if self.tail == -1:
+            self.head = start
+        else:
+            self.next[self.tail] = start
+        self.tail = start + count - 1
+        self.size += count
+
+    def insert(self, data, position=None):
+        """Add node to the linked list
+
+        :param str/int/float data: value of the node to be inserted.
+        :param int position: position where the node will be inserted. If set to None,
+            the node will be added at the end of the linked list.
+        :raises ValueError: if ``position`` is incorrect.
+        """
+        if position is None or (position == self.size and position > 0):
+            self.append(data)
+        elif position == 0:
+            i = self.allocate(data)
+            self.next[i] = self.head
+            self.head = i
+            if self.tail == -1:
+                self.tail = i
+            self.size += 1
+        elif self.head == -1 and position > 0:
+            raise ValueError("position is out of range. Linked list is empty")
+        elif not 0 < position < self.size:
+            raise ValueError(
+                f"position is out of range. Linked list has {self.size} elements"
+            )
+        else:
+            previous = self.locate(position - 1)
+            i = self.allocate(data)
+            self.next[i] = self.next[previous]
+            self.next[previous] = i
+            self.size += 1
+
+    def remove(self, position):
+        """Remove node in the linked list.
+
+        :param int position: position of the node to remove.
+        :raises ValueError: if ``position``  is incorrect.
+        """
+        if self.head == -1:
+            raise ValueError("Linked list is empty")
+        elif not 0 <= position < self.size:
+            raise ValueError(
+                f"position is out of range. Linked list has {self.size} elements"
+            )
+        elif position == 0:
+            i = self.head
+            self.head = self.next[i]
+            if self.head == -1:
+                self.tail = -1
+        else:
+            previous = self.locate(position - 1)
+            i = self.next[previous]
+            self.next[previous] = self.next[i]
+            if self.tail == i:
+                self.tail = previous
+        self.release(i)
+        self.size -= 1
+
+    def locate(self, position):
+        """Find slot of the node at a position.
+
+        :param int position: position of the node.
+        :return: (*int*) -- index of the slot.
+        """
+        i, link = self.head, self.next
+        for _ in range(position):
+            i = link[i]
+        return i
+
+    def allocate(self, data):
+        """Store value of a new node, in a slot of the free list if any.
+
+        :param str/int/float data: value of the node.
+        :return: (*int*) -- index of the slot.
+        """
+        if self.free == -1:
+            self.data.append(data)
+            self.next.append(-1)
+            return len(self.next) - 1
+        i = self.free
+        self.free = self.next[i]
+        self.data[i], self.next[i] = data, -1
+        return i
+
+    def release(self, i):
+        """Add slot of a removed node to the free list.
+
+        :param int i: index of the slot.
+        """
+        if isinstance(self.data, list):
+            self.data[i] = None
+        self.next[i] = self.free
+        self.free = i
+
+    def __repr__(self):
+        nodes = [str(n.data) for n in self]
+        nodes.append("None")
+        return " -> ".join(nodes)
+
+    def __iter__(self):
+        i, link = self.head, self.next
+        while i != -1:
+            yield PooledNode(self, i)
+            i = link[i]
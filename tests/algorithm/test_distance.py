@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from sklearn.metrics import pairwise_distances
+
+from interview.algorithm.distance import (
+    check_metric,
+    from_distance,
+    pairwise_distance,
+    reduced_distance,
+    to_distance,
+)
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((20, 4)), rng.standard_normal((30, 4))
+
+
+@pytest.mark.parametrize(
+    "metric", ["euclidean", "sqeuclidean", "manhattan", "chebyshev", "cosine"]
+)
+def test_pairwise_distance(data, metric):
+    a, b = data
+    reference = "cityblock" if metric == "manhattan" else metric
+    assert np.allclose(
+        pairwise_distance(a, b, metric), pairwise_distances(a, b, metric=reference)
+    )
+
+
+@pytest.mark.parametrize("p", [1, 1.5, 3])
+def test_minkowski_distance(data, p):
+    a, b = data
+    assert np.allclose(
+        pairwise_distance(a, b, "minkowski", p=p),
+        pairwise_distances(a, b, metric="minkowski", p=p),
+    )
+
+
+def test_reduced_distance_preserves_ranking(data):
+    a, b = data
+    for metric, p in [("euclidean", 2), ("minkowski", 3)]:
+        reduced = reduced_distance(a, b, metric, p)
+        distance = pairwise_distance(a, b, metric, p)
+        assert np.allclose(to_distance(reduced, metric, p), distance)
+        assert np.allclose(from_distance(distance, metric, p), reduced)
+        assert (np.argsort(reduced) == np.argsort(distance)).all()
+
+
+def test_check_metric():
+    with pytest.raises(ValueError, match="metric must be one of"):
+        check_metric("hamming")
+    with pytest.raises(ValueError, match="p must be greater or equal to 1"):
+        check_metric("minkowski", p=0.5)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from interview.algorithm.external_sort import external_sort
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+@pytest.mark.parametrize("dtype", ["<i8", "<f4", ">u4"])
+def test_external_sort(tmp_path, dtype, n_jobs):
+    rng = np.random.default_rng(0)
+    data = (rng.standard_normal(10000) * 1000).astype(dtype)
+    data.tofile(tmp_path / "input.bin")
+
+    throughput = external_sort(
+        tmp_path / "input.bin",
+        tmp_path / "output.bin",
+        dtype,
+        chunk_size=4096,
+        n_jobs=n_jobs,
+        tmp_dir=tmp_path,
+        buffer_size=8192,
+    )
+    assert throughput > 0
+    output = np.fromfile(tmp_path / "output.bin", dtype=dtype)
+    np.testing.assert_array_equal(output, np.sort(data))
+
+
+def test_external_sort_structured(tmp_path):
+    dtype = np.dtype([("key", "<u2"), ("value", "<i8")])
+    data = np.zeros(5000, dtype=dtype)
+    data["key"] = np.random.default_rng(0).integers(0, 50, len(data))
+    data["value"] = np.arange(len(data))
+    data.tofile(tmp_path / "input.bin")
+
+    external_sort(
+        tmp_path / "input.bin",
+        tmp_path / "output.bin",
+        dtype,
+        order="key",
+        chunk_size=10000,
+        buffer_size=4096,
+    )
+    output = np.fromfile(tmp_path / "output.bin", dtype=dtype)
+    np.testing.assert_array_equal(output, data[np.argsort(data["key"], kind="stable")])
+
+
+def test_external_sort_empty(tmp_path):
+    (tmp_path / "input.bin").write_bytes(b"")
+    external_sort(tmp_path / "input.bin", tmp_path / "output.bin", "<i8")
+    assert (tmp_path / "output.bin").read_bytes() == b""
+
+
+def test_external_sort_invalid(tmp_path):
+    (tmp_path / "input.bin").write_bytes(b"\x00" * 12)
+    with pytest.raises(ValueError, match="multiple of the record size"):
+        external_sort(tmp_path / "input.bin", tmp_path / "output.bin", "<i8")
+    with pytest.raises(ValueError, match="order must be given"):
+        external_sort(
+            tmp_path / "input.bin",
+            tmp_path / "output.bin",
+            [("key", "<i4"), ("value", "<i8")],
+        )
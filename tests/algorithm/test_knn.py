@@ -1,9 +1,12 @@
-from sklearn.datasets import load_breast_cancer, load_diabetes
-from sklearn.metrics import accuracy_score
+import numpy as np
+import pytest
+from sklearn.datasets import load_breast_cancer, load_diabetes, make_regression
+from sklearn.metrics import accuracy_score, pairwise_distances
 from sklearn.model_selection import train_test_split
 from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
 
 from interview.algorithm.knn import KNNClassifier, KNNRegressor
+from interview.algorithm.spatial_index import KDTree
 
 
 def test_knn_classifier():
@@ -43,3 +46,301 @@ def test_knn_regressor():
         predict[k] = model[k].predict(x_test)
 
     assert all([r == a for r, a in zip(predict["reference"], predict["actual"])])
+
+
+def test_knn_memory_budget():
+    data = load_breast_cancer(return_X_y=True)
+    x_train, x_test, y_train, y_test = train_test_split(
+        data[0], data[1], test_size=1 / 3, random_state=0
+    )
+
+    model = {"large": KNNClassifier(3), "small": KNNClassifier(3, memory_budget=1)}
+    for m in model.values():
+        m.fit(x_train, y_train)
+    assert model["small"].block_size() == 1
+
+    assert (
+        model["large"].kneighbors(x_test) == model["small"].kneighbors(x_test)
+    ).all()
+
+
+def test_knn_find_neighbors():
+    data = load_diabetes(return_X_y=True)
+    model = KNNRegressor(5)
+    model.fit(data[0][1:], data[1][1:])
+
+    distance = [model.euclidean_distance(data[0][0], e) for e in data[0][1:]]
+    id = np.argsort(distance)[:5]
+    features, outcomes = model.find_neighbors(data[0][0])
+    assert np.array_equal(features, data[0][1:][id])
+    assert np.array_equal(outcomes, data[1][1:][id])
+
+
+@pytest.mark.parametrize("algorithm", ["kd_tree", "ball_tree", "auto"])
+def test_knn_algorithm(algorithm):
+    data = load_diabetes(return_X_y=True)
+    x_train, x_test, y_train, y_test = train_test_split(
+        data[0], data[1], test_size=1 / 3, random_state=0
+    )
+
+    model = {"brute": KNNRegressor(3), algorithm: KNNRegressor(3, algorithm=algorithm)}
+    for m in model.values():
+        m.fit(x_train, y_train)
+
+    assert (
+        model["brute"].kneighbors(x_test) == model[algorithm].kneighbors(x_test)
+    ).all()
+
+
+def test_knn_unknown_algorithm():
+    with pytest.raises(ValueError, match="algorithm must be one of"):
+        KNNClassifier(3, algorithm="quadtree")
+
+
+def test_knn_approximate():
+    data = load_breast_cancer(return_X_y=True)
+    x_train, x_test, y_train, y_test = train_test_split(
+        data[0], data[1], test_size=1 / 3, random_state=0
+    )
+
+    model = KNNClassifier(3, algorithm="rp_forest", n_trees=20, random_state=0)
+    model.fit(x_train, y_train)
+    assert len(model.predict(x_test)) == len(x_test)
+
+    exact = KNNClassifier(3)
+    exact.fit(x_train, y_train)
+    recall = np.mean(
+        [
+            len(np.intersect1d(a, e)) / 3
+            for a, e in zip(model.kneighbors(x_test), exact.kneighbors(x_test))
+        ]
+    )
+    assert recall > 0.9
+
+
+@pytest.mark.parametrize("algorithm", ["brute", "kd_tree"])
+def test_knn_parallel(algorithm):
+    data = load_diabetes(return_X_y=True)
+    x_train, x_test, y_train, y_test = train_test_split(
+        data[0], data[1], test_size=1 / 3, random_state=0
+    )
+
+    model = {
+        "serial": KNNRegressor(3, algorithm=algorithm),
+        "parallel": KNNRegressor(3, algorithm=algorithm, n_jobs=3, memory_budget=2**16),
+    }
+    predict = {}
+    for k in model.keys():
+        model[k].fit(x_train, y_train)
+        predict[k] = model[k].predict(x_test)
+
+    assert model["parallel"].workers() == 3
+    assert predict["serial"] == predict["parallel"]
+
+
+def test_knn_out_of_core(tmp_path):
+    data = load_diabetes(return_X_y=True)
+    x_train, x_test, y_train, y_test = train_test_split(
+        data[0], data[1], test_size=1 / 3, random_state=0
+    )
+    np.save(tmp_path / "x_train.npy", x_train)
+    x_train.astype(np.float32).tofile(tmp_path / "x_train.bin")
+
+    reference = KNNRegressor(3)
+    reference.fit(x_train, y_train)
+
+    model = KNNRegressor(3, chunk_size=50)
+    model.fit(str(tmp_path / "x_train.npy"), y_train)
+    assert isinstance(model.x_train, np.memmap)
+    assert model.predict(x_test) == reference.predict(x_test)
+
+    model = KNNRegressor(3, memory_budget=2**12)
+    model.fit(tmp_path / "x_train.bin", y_train, dtype=np.float32, n_features=10)
+    assert model.chunk() < len(x_train)
+    assert model.x_train.shape == x_train.shape
+    features, outcomes = model.find_neighbors(x_test[0])
+    assert isinstance(features, np.ndarray) and features.shape == (3, 10)
+
+    with pytest.raises(ValueError, match="dtype must be given for raw binary file"):
+        model.fit(tmp_path / "x_train.bin", y_train)
+
+
+def test_knn_out_of_core_outcomes_dtype(tmp_path):
+    rng = np.random.default_rng(0)
+    x_train = rng.random((100, 3))
+    y_train = rng.integers(0, 3, 100)
+    x_train.astype(np.float32).tofile(tmp_path / "x_train.bin")
+    y_train.astype(np.int8).tofile(tmp_path / "y_train.bin")
+
+    model = KNNClassifier(3)
+    model.fit(
+        tmp_path / "x_train.bin",
+        tmp_path / "y_train.bin",
+        dtype=np.float32,
+        n_features=3,
+        y_dtype=np.int8,
+    )
+    assert model.y_train.tolist() == y_train.tolist()
+    with pytest.raises(ValueError, match="dtype must be given for raw binary file"):
+        model.fit(tmp_path / "x_train.bin", tmp_path / "y_train.bin", np.float32, 3)
+
+
+def test_knn_out_of_core_is_searched_by_brute_force(tmp_path):
+    x_train = np.random.default_rng(0).random((50000, 2))
+    np.save(tmp_path / "x_train.npy", x_train)
+
+    model = KNNRegressor(3, algorithm="auto")
+    model.fit(tmp_path / "x_train.npy", x_train.sum(axis=1))
+    assert model.index is None
+    model.fit(x_train, x_train.sum(axis=1))
+    assert isinstance(model.index, KDTree)
+
+    with pytest.raises(ValueError, match="searched by brute force"):
+        KNNRegressor(3, algorithm="kd_tree").fit(
+            tmp_path / "x_train.npy", x_train.sum(axis=1)
+        )
+
+
+@pytest.mark.parametrize(
+    "metric, p",
+    [("manhattan", 2), ("chebyshev", 2), ("minkowski", 3), ("cosine", 2)],
+)
+def test_knn_metric(metric, p):
+    data = make_regression(n_samples=300, n_features=5, random_state=0)
+    x_train, x_test, y_train, y_test = train_test_split(
+        data[0], data[1], test_size=1 / 3, random_state=0
+    )
+
+    model = {
+        "reference": KNeighborsRegressor(
+            n_neighbors=3, algorithm="brute", metric=metric, p=p
+        ),
+        "actual": KNNRegressor(3, metric=metric, p=p),
+    }
+    predict = {}
+    for k in model.keys():
+        model[k].fit(x_train, y_train)
+        predict[k] = model[k].predict(x_test)
+
+    assert np.allclose(predict["reference"], predict["actual"])
+
+    if metric != "cosine":
+        tree = KNNRegressor(3, algorithm="kd_tree", metric=metric, p=p)
+        tree.fit(x_train, y_train)
+        assert np.allclose(tree.predict(x_test), predict["actual"])
+
+
+def test_knn_precomputed():
+    data = load_breast_cancer(return_X_y=True)
+    x_train, x_test, y_train, y_test = train_test_split(
+        data[0], data[1], test_size=1 / 3, random_state=0
+    )
+
+    reference = KNNClassifier(3)
+    reference.fit(x_train, y_train)
+    model = KNNClassifier(3, metric="precomputed")
+    model.fit(pairwise_distances(x_train), y_train)
+
+    assert model.predict(pairwise_distances(x_test, x_train)) == reference.predict(
+        x_test
+    )
+
+
+def test_knn_incompatible_metric():
+    with pytest.raises(ValueError, match="precomputed distances are searched"):
+        KNNClassifier(3, algorithm="kd_tree", metric="precomputed")
+    with pytest.raises(ValueError, match="cosine metric is not supported"):
+        KNNClassifier(3, algorithm="ball_tree", metric="cosine")
+    with pytest.raises(ValueError, match="metric must be one of"):
+        KNNClassifier(3, metric="hamming")
+
+
+@pytest.mark.parametrize("algorithm", ["brute", "kd_tree", "ball_tree"])
+def test_knn_partial_fit(algorithm):
+    data = load_diabetes(return_X_y=True)
+    x_train, x_test, y_train, y_test = train_test_split(
+        data[0], data[1], test_size=1 / 3, random_state=0
+    )
+
+    reference = KNNRegressor(3)
+    reference.fit(x_train, y_train)
+
+    model = KNNRegressor(3, algorithm=algorithm)
+    model.fit(x_train[:10], y_train[:10])
+    for i in range(10, len(x_train), 7):
+        model.partial_fit(x_train[i : i + 7], y_train[i : i + 7])
+    assert len(model.x_buffer) < 2 * len(x_train)
+    assert model.predict(x_test) == reference.predict(x_test)
+
+
+@pytest.mark.parametrize("algorithm", ["brute", "kd_tree"])
+def test_knn_partial_fit_max_size(algorithm):
+    data = load_diabetes(return_X_y=True)
+    x_train, x_test, y_train, y_test = train_test_split(
+        data[0], data[1], test_size=1 / 3, random_state=0
+    )
+
+    reference = KNNRegressor(3)
+    reference.fit(x_train[-100:], y_train[-100:])
+
+    model = KNNRegressor(3, algorithm=algorithm, max_size=100)
+    for x, y in zip(x_train, y_train):
+        model.partial_fit(x, y)
+    assert len(model.x_train) == 100
+    assert model.predict(x_test) == reference.predict(x_test)
+
+
+@pytest.mark.parametrize("algorithm", ["kd_tree", "ball_tree", "rp_forest"])
+def test_knn_partial_fit_max_size_lower_than_k(algorithm):
+    reference = KNNRegressor(3, max_size=2)
+    model = KNNRegressor(3, algorithm=algorithm, max_size=2, random_state=0)
+    for i in range(10):
+        reference.partial_fit([i, i], i)
+        model.partial_fit([i, i], i)
+
+    assert model.kneighbors([[0, 0]]).tolist() == [[0, 1]]
+    assert model.predict([[0, 0]]) == reference.predict([[0, 0]]) == [8.5]
+
+
+def test_knn_partial_fit_max_size_rp_forest():
+    rng = np.random.default_rng(0)
+    x_train, x_test = rng.random((1400, 4)), rng.random((50, 4))
+    y_train = x_train.sum(axis=1)
+
+    model = KNNRegressor(
+        3,
+        algorithm="rp_forest",
+        max_size=1000,
+        n_trees=3,
+        n_candidates=20,
+        random_state=0,
+    )
+    model.fit(x_train[:1000], y_train[:1000])
+    model.partial_fit(x_train[1000:], y_train[1000:])
+    assert model.index_first < model.first
+
+    id = model.kneighbors(x_test)
+    assert id.shape == (len(x_test), 3)
+    assert ((id >= 0) & (id < 1000)).all()
+    assert all(len(set(i)) == 3 for i in id)
+
+
+def test_knn_partial_fit_window():
+    model = KNNClassifier(1, window=10)
+    for t in range(30):
+        model.partial_fit([t, 0], t % 3, timestamp=t)
+
+    assert list(model.x_train[:, 0]) == list(range(19, 30))
+    assert model.predict([[0, 0], [29, 0]]) == [19 % 3, 29 % 3]
+
+
+def test_knn_partial_fit_index_is_not_rebuilt_for_every_example():
+    rng = np.random.default_rng(0)
+    model = KNNRegressor(3, algorithm="kd_tree")
+    builds = 0
+    for x in rng.random((1000, 2)):
+        index = getattr(model, "index", None)
+        model.partial_fit(x, x.sum())
+        builds += model.index is not index
+
+    assert builds <= 11
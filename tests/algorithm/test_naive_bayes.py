@@ -1,9 +1,16 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
 from sklearn.datasets import load_iris
 from sklearn.metrics import accuracy_score
 from sklearn.model_selection import train_test_split
-from sklearn.naive_bayes import GaussianNB
+from sklearn.naive_bayes import BernoulliNB, GaussianNB, MultinomialNB
 
-from interview.algorithm.naive_bayes import GaussianNaiveBayes
+from interview.algorithm.naive_bayes import (
+    BernoulliNaiveBayes,
+    GaussianNaiveBayes,
+    MultinomialNaiveBayes,
+)
 
 
 def test_naive_bayes():
@@ -25,3 +32,138 @@ def test_naive_bayes():
         y_test, predict["actual"]
     )
     assert all([r == a for r, a in zip(predict["reference"], predict["actual"])])
+
+
+def test_naive_bayes_partial_fit():
+    data = load_iris(return_X_y=True)
+    x_train, x_test, y_train, y_test = train_test_split(
+        data[0], data[1], test_size=0.5, random_state=0
+    )
+
+    reference = GaussianNaiveBayes()
+    reference.fit(x_train, y_train)
+
+    order = np.argsort(y_train, kind="stable")
+    model = GaussianNaiveBayes()
+    for i in range(0, len(order), 7):
+        model.partial_fit(x_train[order[i : i + 7]], y_train[order[i : i + 7]])
+
+    assert model.classes == reference.classes == [0, 1, 2]
+    assert model.class_count == reference.class_count
+    for c in model.classes:
+        f = x_train[y_train == c]
+        assert np.allclose(model.mean()[c], f.mean(axis=0))
+        assert np.allclose(model.variance()[c], f.var(axis=0))
+    assert model.predict(x_test) == reference.predict(x_test)
+
+
+def test_naive_bayes_fit_stream():
+    data = load_iris(return_X_y=True)
+    x_train, x_test, y_train, y_test = train_test_split(
+        data[0], data[1], test_size=0.5, random_state=0
+    )
+
+    reference = GaussianNaiveBayes()
+    reference.fit(x_train, y_train)
+
+    model = GaussianNaiveBayes()
+    model.fit(x_test, y_test)
+    model.fit_stream(
+        (x_train[i : i + 10], y_train[i : i + 10]) for i in range(0, len(x_train), 10)
+    )
+    assert model.calculate_prior() == pytest.approx(reference.calculate_prior())
+    assert model.predict(x_test) == reference.predict(x_test)
+
+
+def test_naive_bayes_predict_proba():
+    data = load_iris(return_X_y=True)
+    x_train, x_test, y_train, y_test = train_test_split(
+        data[0], data[1], test_size=0.5, random_state=0
+    )
+
+    reference = GaussianNB(var_smoothing=0)
+    reference.fit(x_train, y_train)
+    model = GaussianNaiveBayes()
+    model.fit(x_train, y_train)
+
+    assert np.allclose(model.predict_proba(x_test), reference.predict_proba(x_test))
+    assert np.allclose(
+        model.predict_log_proba(x_test), reference.predict_log_proba(x_test)
+    )
+    assert np.allclose(model.predict_proba(x_test).sum(axis=1), 1)
+
+
+def test_naive_bayes_joint_log_likelihood():
+    data = load_iris(return_X_y=True)
+    model = GaussianNaiveBayes()
+    model.fit(data[0], data[1])
+
+    prior = model.calculate_prior()
+    for example, jll in zip(data[0], model.joint_log_likelihood(data[0])):
+        expected = [
+            np.log(prior[c])
+            + sum(
+                model.log_likelihood(f, model.mean()[c][i], model.variance()[c][i])
+                for i, f in enumerate(example)
+            )
+            for c in model.classes
+        ]
+        assert np.allclose(jll, expected)
+
+
+def test_naive_bayes_large_offset():
+    rng = np.random.default_rng(0)
+    y = np.repeat([0, 1], 500)
+    x = 1e8 + rng.standard_normal((1000, 3)) + 0.5 * y[:, None]
+    model = GaussianNaiveBayes()
+    model.fit(x, y)
+    expected = GaussianNB(var_smoothing=0).fit(x, y)
+
+    assert np.allclose(
+        model.joint_log_likelihood(x), expected.predict_joint_log_proba(x)
+    )
+    assert model.predict(x) == list(expected.predict(x))
+
+
+@pytest.fixture
+def counts():
+    rng = np.random.default_rng(0)
+    x = sp.random(200, 1000, density=0.01, format="csr", random_state=0)
+    x.data = rng.integers(1, 5, size=x.nnz).astype(float)
+    y = rng.integers(0, 3, size=200)
+    return x, y
+
+
+@pytest.mark.parametrize("alpha", [1.0, 0.5])
+def test_multinomial_naive_bayes(counts, alpha):
+    x, y = counts
+    reference = MultinomialNB(alpha=alpha)
+    reference.fit(x, y)
+    model = MultinomialNaiveBayes(alpha=alpha)
+    model.fit(x, y)
+
+    assert np.allclose(model.predict_log_proba(x), reference.predict_log_proba(x))
+    assert model.predict(x) == list(reference.predict(x))
+    assert model.predict(x.toarray()) == model.predict(x)
+
+
+@pytest.mark.parametrize("alpha", [1.0, 0.5])
+def test_bernoulli_naive_bayes(counts, alpha):
+    x, y = counts
+    reference = BernoulliNB(alpha=alpha)
+    reference.fit(x, y)
+    model = BernoulliNaiveBayes(alpha=alpha)
+    model.fit(x, y)
+
+    assert np.allclose(model.predict_log_proba(x), reference.predict_log_proba(x))
+    assert model.predict(x) == list(reference.predict(x))
+
+
+def test_discrete_naive_bayes_partial_fit(counts):
+    x, y = counts
+    for cls in [MultinomialNaiveBayes, BernoulliNaiveBayes]:
+        reference = cls()
+        reference.fit(x, y)
+        model = cls()
+        model.fit_stream((x[i : i + 30], y[i : i + 30]) for i in range(0, 200, 30))
+        assert np.allclose(model.predict_proba(x), reference.predict_proba(x))
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.datasets import load_diabetes, load_iris
+
+from interview.algorithm.knn import KNNClassifier, KNNRegressor
+from interview.algorithm.naive_bayes import GaussianNaiveBayes, MultinomialNaiveBayes
+from interview.algorithm.persistence import ALIGNMENT, load, save
+
+
+@pytest.fixture
+def iris():
+    return load_iris(return_X_y=True)
+
+
+@pytest.mark.parametrize("algorithm", ["brute", "kd_tree", "ball_tree", "rp_forest"])
+def test_save_load_knn(tmp_path, iris, algorithm):
+    model = KNNClassifier(3, algorithm=algorithm, random_state=0)
+    model.fit(iris[0], iris[1])
+    save(model, tmp_path / "knn.bin")
+
+    loaded = load(tmp_path / "knn.bin")
+    assert isinstance(loaded, KNNClassifier)
+    assert loaded.predict(iris[0]) == model.predict(iris[0])
+    assert not loaded.x_train.flags.writeable
+    assert not loaded.x_train.flags.owndata
+    assert loaded.x_train.ctypes.data % ALIGNMENT == 0
+
+
+def test_save_load_knn_partial_fit(tmp_path):
+    data = load_diabetes(return_X_y=True)
+    model = KNNRegressor(3, algorithm="kd_tree", max_size=300)
+    model.fit(data[0][:200], data[1][:200])
+    model.partial_fit(data[0][200:400], data[1][200:400])
+    save(model, tmp_path / "knn.bin")
+
+    loaded = load(tmp_path / "knn.bin")
+    assert loaded.predict(data[0]) == model.predict(data[0])
+
+    for m in [model, loaded]:
+        m.partial_fit(data[0][400:], data[1][400:])
+    assert loaded.predict(data[0]) == model.predict(data[0])
+
+
+def test_save_load_naive_bayes(tmp_path, iris):
+    model = GaussianNaiveBayes()
+    model.fit(iris[0], iris[1])
+    save(model, tmp_path / "nb.bin")
+
+    loaded = load(tmp_path / "nb.bin")
+    assert loaded.classes == model.classes
+    assert loaded.class_count == model.class_count
+    assert np.array_equal(loaded.predict_proba(iris[0]), model.predict_proba(iris[0]))
+
+    x = sp.random(50, 100, density=0.1, format="csr", random_state=0)
+    y = np.array(["spam", "ham"] * 25)
+    model = MultinomialNaiveBayes(alpha=0.5)
+    model.fit(x, y)
+    save(model, tmp_path / "nb.bin")
+    assert load(tmp_path / "nb.bin").predict(x) == model.predict(x)
+
+
+def test_load_wrong_file(tmp_path):
+    (tmp_path / "model.bin").write_bytes(b"not a model, really")
+    with pytest.raises(ValueError, match="not a model file"):
+        load(tmp_path / "model.bin")
@@ -1,6 +1,24 @@
+import random
+from array import array
+
+import numpy as np
 import pytest
 
-from interview.algorithm.sort import bubblesort, quicksort
+from interview.algorithm.sort import (
+    bubblesort,
+    counting_sort,
+    heapsort,
+    insertion_sort,
+    introsort,
+    mergesort,
+    numeric_sort,
+    partial_sort,
+    partition3,
+    quickselect,
+    quicksort,
+    radix_sort,
+    topk,
+)
 
 
 @pytest.fixture
@@ -27,3 +45,170 @@ def test_quicksort_inplace(input, output):
 def test_bubblesort(input, output):
     for i, o in zip(input, output):
         assert bubblesort(i) == o
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        list(range(5000)),
+        list(range(5000, 0, -1)),
+        [random.randint(0, 3) for _ in range(5000)],
+        [7] * 5000,
+        list(range(2500)) + list(range(2500, 0, -1)),
+        [random.random() for _ in range(5000)],
+    ],
+    ids=["sorted", "reversed", "duplicates", "constant", "organ_pipe", "random"],
+)
+def test_introsort(array):
+    expected = sorted(array)
+    introsort(array)
+    assert array == expected
+
+
+def test_introsort_range():
+    array = [9, 8, 7, 6, 5, 4, 3, 2, 1, 0] * 5
+    expected = array[:10] + sorted(array[10:40]) + array[40:]
+    introsort(array, 10, 39)
+    assert array == expected
+
+
+def test_partition3():
+    array = [3, 5, 1, 3, 4, 3, 2]
+    lt, gt = partition3(array, 0, len(array) - 1, 3)
+    assert all(x < 3 for x in array[:lt])
+    assert array[lt : gt + 1] == [3, 3, 3]
+    assert all(x > 3 for x in array[gt + 1 :])
+
+
+def test_heapsort(input, output):
+    for i, o in zip(input, output):
+        heapsort(i)
+        assert i == o
+
+
+def test_insertion_sort(input, output):
+    for i, o in zip(input, output):
+        insertion_sort(i)
+        assert i == o
+
+
+def test_quicksort_keeps_duplicates():
+    array = [3, 1, 3, 2, 1, 3]
+    assert quicksort(array, inplace=False) == [1, 1, 2, 3, 3, 3]
+    assert array == [3, 1, 3, 2, 1, 3]
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize("n", [0, 1, 31, 32, 33, 1000])
+def test_quicksort_key_reverse(n, reverse):
+    records = [(random.randint(0, 9), i) for i in range(n)]
+    expected = sorted(records, key=lambda r: r[0], reverse=reverse)
+    result = quicksort(records, inplace=False, key=lambda r: r[0], reverse=reverse)
+    assert result == expected
+    quicksort(records, key=lambda r: r[0], reverse=reverse)
+    assert records == expected
+
+
+def test_quicksort_stable():
+    array = [1.0, 1, True, 0, 0.0, False]
+    result = quicksort(array, inplace=False, stable=True)
+    assert [type(x) for x in result] == [int, float, bool, float, int, bool]
+
+
+def test_mergesort(input, output):
+    for i, o in zip(input, output):
+        assert mergesort(i) == o
+        assert mergesort(iter(i), reverse=True) == o[::-1]
+
+
+@pytest.mark.parametrize("dtype", ["i1", "u1", "i2", "u4", "i8", "u8", "f4", "f8"])
+def test_radix_sort(dtype):
+    rng = np.random.default_rng(0)
+    if dtype[0] == "f":
+        a = (rng.standard_normal(5000) * 1000).astype(dtype)
+        a[:3] = [-np.inf, np.inf, -0.0]
+    else:
+        info = np.iinfo(dtype)
+        a = rng.integers(info.min, info.max, 5000, dtype=dtype, endpoint=True)
+    expected = np.sort(a)
+    radix_sort(a)
+    np.testing.assert_array_equal(a, expected)
+
+
+@pytest.mark.parametrize("dtype", ["i1", "u2", "i4", "i8"])
+def test_counting_sort(dtype):
+    a = np.random.default_rng(0).integers(-50 if dtype[0] == "i" else 0, 100, 5000)
+    a = a.astype(dtype)
+    expected = np.sort(a)
+    counting_sort(a)
+    np.testing.assert_array_equal(a, expected)
+
+
+def test_counting_sort_float():
+    with pytest.raises(TypeError):
+        counting_sort(np.array([1.5, 0.5]))
+
+
+def test_numeric_sort():
+    a = array("d", [3.0, -1.0, 2.5, -0.5])
+    numeric_sort(a, reverse=True)
+    assert a == array("d", [3.0, 2.5, -0.5, -1.0])
+    with pytest.raises(TypeError):
+        numeric_sort([3, 1, 2])
+
+
+def test_quicksort_typed():
+    a = np.array([5, 3, 9, 1, 7])
+    quicksort(a, 1, 3)
+    np.testing.assert_array_equal(a, [5, 1, 3, 9, 7])
+
+    a = array("i", [3, 1, 2])
+    result = quicksort(a, inplace=False)
+    assert result == array("i", [1, 2, 3])
+    assert a == array("i", [3, 1, 2])
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        [random.random() for _ in range(2000)],
+        list(range(2000)),
+        list(range(2000, 0, -1)),
+        [random.randint(0, 2) for _ in range(2000)],
+        [5] * 2000,
+    ],
+    ids=["random", "sorted", "reversed", "duplicates", "constant"],
+)
+def test_quickselect(array):
+    expected = sorted(array)
+    for k in (0, 1, 999, 1998, 1999):
+        assert quickselect(array, k) == expected[k]
+        assert max(array[:k], default=array[k]) <= array[k]
+        assert min(array[k:]) == array[k]
+    with pytest.raises(IndexError):
+        quickselect(array, 2000)
+
+
+def test_partial_sort():
+    array = [random.randint(0, 100) for _ in range(500)]
+    expected = sorted(array)
+    partial_sort(array, 50)
+    assert array[:50] == expected[:50]
+    assert sorted(array) == expected
+    partial_sort(array, 1000)
+    assert array == expected
+
+
+def test_topk():
+    array = [random.random() for _ in range(1000)]
+    assert topk(array, 10) == sorted(array)[:10]
+    assert topk(iter(array), 10) == sorted(array)[:10]
+    assert topk(array, 0) == []
+    assert topk((x for x in [3, 1, 2]), 5) == [1, 2, 3]
+
+
+def test_topk_key():
+    records = [(random.randint(0, 5), i) for i in range(300)]
+    expected = sorted(records, key=lambda r: r[0])[:20]
+    assert topk(records, 20, key=lambda r: r[0]) == expected
+    assert topk(iter(records), 20, key=lambda r: r[0]) == expected
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from interview.algorithm.distance import pairwise_distance
+from interview.algorithm.spatial_index import BallTree, KDTree, RandomProjectionForest
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    return rng.random((500, 3)), rng.random((50, 3))
+
+
+@pytest.mark.parametrize("tree", [KDTree, BallTree])
+def test_query(data, tree):
+    x_train, x_test = data
+    index = tree(x_train, leaf_size=10)
+    distance, id = index.query(x_test, 4)
+
+    expected = np.sqrt(np.square(x_test[:, None, :] - x_train[None, :, :]).sum(axis=2))
+    assert np.array_equal(id, np.argsort(expected, axis=1)[:, :4])
+    assert np.allclose(distance, np.sort(expected, axis=1)[:, :4])
+
+
+@pytest.mark.parametrize("tree", [KDTree, BallTree])
+def test_node_storage(data, tree):
+    index = tree(data[0], leaf_size=10)
+    leaf = index.left == -1
+    assert (index.end[leaf] - index.start[leaf] <= 10).all()
+    assert (index.right[leaf] == -1).all()
+    assert sorted(index.index) == list(range(len(data[0])))
+
+
+@pytest.mark.parametrize("tree", [KDTree, BallTree])
+def test_query_skips_first(data, tree):
+    x_train, x_test = data
+    distance, id = tree(x_train, leaf_size=10).query(x_test, 4, first=100)
+
+    expected = np.sqrt(np.square(x_test[:, None, :] - x_train[None, 100:, :]).sum(2))
+    assert np.array_equal(id, 100 + np.argsort(expected, axis=1)[:, :4])
+    assert np.allclose(distance, np.sort(expected, axis=1)[:, :4])
+
+
+def test_k_larger_than_training_dataset(data):
+    distance, id = KDTree(data[0][:3]).query(data[1], 5)
+    assert id.shape == (len(data[1]), 3)
+
+
+def test_random_projection_forest(data):
+    x_train, x_test = data
+    forest = RandomProjectionForest(x_train, n_trees=5, leaf_size=20, random_state=0)
+    distance, id = forest.query(x_test, 4)
+    assert id.shape == (len(x_test), 4)
+    assert (id >= 0).all()
+    assert all(len(set(i)) == 4 for i in id)
+    assert (np.diff(distance, axis=1) >= 0).all()
+
+    expected = np.sqrt(np.square(x_test[:, None, :] - x_train[None, :, :]).sum(axis=2))
+    assert np.allclose(distance, np.take_along_axis(expected, id, axis=1))
+
+
+def test_random_projection_forest_skips_first(data):
+    x_train, x_test = data
+    forest = RandomProjectionForest(x_train, n_trees=2, leaf_size=10, random_state=0)
+    distance, id = forest.query(x_test, 30, first=250)
+    assert id.shape == (len(x_test), 30)
+    assert ((id == -1) | (id >= 250)).all()
+    assert np.isinf(distance[id == -1]).all()
+
+
+def test_random_projection_forest_exact_with_single_leaf(data):
+    x_train, x_test = data
+    forest = RandomProjectionForest(x_train, n_trees=1, leaf_size=len(x_train))
+    id = forest.query(x_test, 4)[1]
+
+    expected = np.sqrt(np.square(x_test[:, None, :] - x_train[None, :, :]).sum(axis=2))
+    assert np.array_equal(id, np.argsort(expected, axis=1)[:, :4])
+
+
+@pytest.mark.parametrize("tree", [KDTree, BallTree])
+@pytest.mark.parametrize(
+    "metric, p",
+    [("sqeuclidean", 2), ("manhattan", 2), ("chebyshev", 2), ("minkowski", 3)],
+)
+def test_query_metric(data, tree, metric, p):
+    x_train, x_test = data
+    distance, id = tree(x_train, leaf_size=10, metric=metric, p=p).query(x_test, 4)
+
+    expected = pairwise_distance(x_test, x_train, metric, p)
+    assert np.array_equal(id, np.argsort(expected, axis=1)[:, :4])
+    assert np.allclose(distance, np.sort(expected, axis=1)[:, :4])
+
+
+def test_cosine_tree(data):
+    with pytest.raises(ValueError, match="cosine metric is not supported"):
+        KDTree(data[0], metric="cosine")
@@ -0,0 +1,99 @@
+import random
+from array import array
+
+import pytest
+
+from interview.data_structure.b_tree import BPlusTree, Internal
+
+
+@pytest.fixture
+def data():
+    return [25, 15, 22, 50, 70, 90, 18, 10, 24, 12, 4, 35, 31, 44, 66]
+
+
+def check(node, low=None, high=None, order=3):
+    assert isinstance(node.keys, array)
+    assert len(node.keys) <= order
+    assert list(node.keys) == sorted(node.keys)
+    assert all(low is None or k >= low for k in node.keys)
+    assert all(high is None or k < high for k in node.keys)
+    if isinstance(node, Internal):
+        assert len(node.children) == len(node.keys) + 1
+        bounds = [low] + list(node.keys) + [high]
+        depth = {
+            check(c, bounds[i], bounds[i + 1], order)
+            for i, c in enumerate(node.children)
+        }
+        assert len(depth) == 1
+        return depth.pop() + 1
+    return 1
+
+
+def test_invalid_order():
+    with pytest.raises(ValueError, match="order must be"):
+        BPlusTree(2)
+
+
+def test_insert(data):
+    tree = BPlusTree(order=3)
+    assert tree.exist(data[0]) == False
+    assert tree.in_order_traversal() is None
+    tree.insert(data)
+    tree.insert(data[0])
+    check(tree.root)
+    assert len(tree) == len(data)
+    assert tree.in_order_traversal() == sorted(data)
+    assert tree.get_min() == min(data)
+    assert tree.get_max() == max(data)
+    assert all(tree.exist(d) for d in data)
+    assert tree.exist(max(data) + 1) == False
+
+
+@pytest.mark.parametrize("order", [3, 4, 64])
+def test_large(order):
+    keys = random.Random(0).sample(range(100000), 5000)
+    tree = BPlusTree(order)
+    tree.insert(keys)
+    check(tree.root, order=order)
+    assert list(tree) == sorted(keys)
+
+    tree = BPlusTree(order)
+    tree.insert(range(5000))
+    check(tree.root, order=order)
+    assert list(tree) == list(range(5000))
+
+
+def test_float_keys():
+    rng = random.Random(0)
+    keys = [rng.random() for _ in range(100)]
+    tree = BPlusTree(order=4, typecode="d")
+    tree.insert(keys)
+    check(tree.root, order=4)
+    assert list(tree) == sorted(keys)
+    assert tree.exist(keys[0])
+    assert tree.head.values is None
+
+
+def test_map(data):
+    tree = BPlusTree(order=4)
+    tree.insert(data[:5])
+    assert tree.head.values is None
+    assert tree[data[0]] is None
+    for d in data:
+        tree[d] = str(d)
+    tree[25] = "root"
+    assert tree[25] == "root"
+    assert tree[4] == "4"
+    assert tree.get(5) is None
+    with pytest.raises(KeyError):
+        tree[5]
+    assert list(tree.items())[:2] == [(4, "4"), (10, "10")]
+
+
+def test_range(data):
+    tree = BPlusTree(order=3)
+    tree.insert(data)
+    assert list(tree.range(11, 35)) == [x for x in sorted(data) if 11 <= x <= 35]
+    assert list(tree.range(0, 3)) == []
+    assert list(tree.range(90, 100)) == [90]
+    assert list(tree.range(0, 100)) == sorted(data)
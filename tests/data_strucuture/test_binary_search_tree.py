@@ -1,6 +1,14 @@
+import math
+import random
+
 import pytest
 
-from interview.data_structure.binary_search_tree import BinarySearchTree
+from interview.data_structure.binary_search_tree import (
+    AVLTree,
+    BinarySearchTree,
+    CompactBinarySearchTree,
+    Node,
+)
 
 
 @pytest.fixture
@@ -92,3 +100,262 @@ def test_check_if_node_in_tree(data):
     assert bst.exist(data[round(len(data) / 2)])
     assert bst.exist(data[-1])
     assert bst.exist(max(data) + 1) == False
+
+
+def check_avl(node):
+    if node is None:
+        return 0
+    left, right = check_avl(node.left), check_avl(node.right)
+    assert abs(left - right) <= 1
+    assert node.height == 1 + max(left, right)
+    assert node.left is None or node.left.data < node.data
+    assert node.right is None or node.right.data > node.data
+    return node.height
+
+
+def test_avl_tree(data):
+    avl = AVLTree()
+    avl.insert(data)
+    check_avl(avl.root)
+    assert avl.in_order_traversal() == sorted(set(data))
+    assert avl.get_min() == min(data)
+    assert avl.get_max() == max(data)
+    assert all(avl.exist(d) for d in data)
+    assert avl.exist(max(data) + 1) == False
+
+
+def test_avl_tree_sorted_insert():
+    avl = AVLTree()
+    avl.insert(range(1, 5001))
+    assert avl.root.height <= 1.44 * math.log2(5001)
+    check_avl(avl.root)
+    assert avl.in_order_traversal() == list(range(1, 5001))
+
+
+def test_avl_tree_delete():
+    keys = list(range(1, 1001))
+    random.shuffle(keys)
+    avl = AVLTree()
+    avl.insert(keys)
+    for k in keys[:900]:
+        avl.delete(k)
+        assert avl.exist(k) == False
+    check_avl(avl.root)
+    assert avl.in_order_traversal() == sorted(keys[900:])
+    with pytest.raises(ValueError, match="is not in tree"):
+        avl.delete(keys[0])
+    for k in keys[900:]:
+        avl.delete(k)
+    assert avl.root is None
+
+
+def test_iter(data):
+    bst = BinarySearchTree()
+    bst.insert(data)
+    assert [node.data for node in bst] == sorted(data)
+
+
+def test_build(data):
+    bst = BinarySearchTree()
+    bst.build(data + data[:3])
+    assert bst.in_order_traversal() == sorted(data)
+    assert bst.pre_order_traversal() == [
+        25,
+        15,
+        10,
+        4,
+        12,
+        22,
+        18,
+        24,
+        50,
+        35,
+        31,
+        44,
+        70,
+        66,
+        90,
+    ]
+
+    bst.build(range(10000))
+    assert [node.data for node in bst] == list(range(10000))
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 100, 1023, 1024])
+def test_avl_tree_build(n):
+    avl = AVLTree()
+    avl.build(range(n, 0, -1))
+    assert check_avl(avl.root) == n.bit_length()
+    assert len(avl) == n
+    assert avl.in_order_traversal() == list(range(1, n + 1))
+    avl.insert(0)
+    avl.delete(n)
+    check_avl(avl.root)
+
+
+def test_merge(data):
+    for tree in (BinarySearchTree(), AVLTree()):
+        tree.merge(data[:7])
+        tree.merge(data[5:] + [1, 100])
+        assert tree.in_order_traversal() == sorted(data + [1, 100])
+        if isinstance(tree, AVLTree):
+            check_avl(tree.root)
+
+
+def check_compact(tree, i=None):
+    i = tree.root if i is None else i
+    if i == -1:
+        return 0
+    left, right = check_compact(tree, tree.left[i]), check_compact(tree, tree.right[i])
+    assert abs(left - right) <= 1
+    assert tree.height[i] == 1 + max(left, right)
+    return tree.height[i]
+
+
+def test_compact_tree(data):
+    tree = CompactBinarySearchTree()
+    assert tree.exist(data[0]) == False
+    tree.insert(data)
+    check_compact(tree)
+    assert len(tree) == len(data)
+    assert tree.in_order_traversal() == sorted(data)
+    assert tree.get_min() == min(data)
+    assert tree.get_max() == max(data)
+    assert all(tree.exist(d) for d in data)
+    assert tree.exist(max(data) + 1) == False
+
+
+def test_compact_tree_traversal(data):
+    bst = BinarySearchTree()
+    bst.build(data)
+    tree = CompactBinarySearchTree()
+    tree.build(data)
+    check_compact(tree)
+    assert tree.pre_order_traversal() == bst.pre_order_traversal()
+    assert tree.post_order_traversal() == bst.post_order_traversal()
+
+
+def test_compact_tree_delete():
+    keys = [random.random() for _ in range(1000)]
+    tree = CompactBinarySearchTree("d")
+    tree.insert(keys)
+    for k in keys[:600]:
+        tree.delete(k)
+    check_compact(tree)
+    assert tree.in_order_traversal() == sorted(keys[600:])
+    with pytest.raises(ValueError, match="is not in tree"):
+        tree.delete(keys[0])
+
+    # Slots of deleted nodes are reused
+    tree.insert(range(600))
+    assert len(tree.key) == 1000
+    assert len(tree) == 1000
+    check_compact(tree)
+
+
+def test_compact_tree_empty_extremum():
+    tree = CompactBinarySearchTree()
+    tree.insert([1, 2])
+    tree.delete(1)
+    tree.delete(2)
+    with pytest.raises(ValueError, match="Tree is empty"):
+        tree.get_min()
+    with pytest.raises(ValueError, match="Tree is empty"):
+        tree.get_max()
+
+
+def test_traversal_falsy_keys():
+    bst = BinarySearchTree()
+    bst.insert([0, -1, 1])
+    assert bst.in_order_traversal() == [-1, 0, 1]
+    assert bst.pre_order_traversal() == [0, -1, 1]
+    assert bst.post_order_traversal() == [-1, 1, 0]
+    assert BinarySearchTree().in_order_traversal() is None
+
+
+def test_traversal_deep_tree():
+    bst = BinarySearchTree()
+    bst.root = node = Node(0)
+    for i in range(1, 10000):
+        node.right = Node(i)
+        node = node.right
+    assert bst.in_order_traversal() == list(range(10000))
+    assert bst.pre_order_traversal() == list(range(10000))
+    assert bst.post_order_traversal() == list(range(9999, -1, -1))
+
+
+def test_range(data):
+    bst = BinarySearchTree()
+    bst.insert(data)
+    assert list(bst.range(11, 35)) == [x for x in sorted(data) if 11 <= x <= 35]
+    assert list(bst.range(0, 3)) == []
+    assert list(bst.range(90, 100)) == [90]
+    assert list(bst.range(91, 100)) == []
+    assert list(BinarySearchTree().range(0, 100)) == []
+
+
+def test_floor_ceiling_successor(data):
+    for tree in (BinarySearchTree(), AVLTree()):
+        tree.insert(data)
+        assert tree.floor(23) == 22
+        assert tree.floor(22) == 22
+        assert tree.floor(3) is None
+        assert tree.ceiling(23) == 24
+        assert tree.ceiling(24) == 24
+        assert tree.ceiling(91) is None
+        assert tree.successor(24) == 25
+        assert tree.successor(23) == 24
+        assert tree.successor(90) is None
+
+
+def test_rank_select():
+    keys = random.sample(range(10000), 2000)
+    for tree in (BinarySearchTree(), AVLTree()):
+        tree.insert(keys)
+        if isinstance(tree, AVLTree):
+            for k in keys[:500]:
+                tree.delete(k)
+        expected = sorted(keys[500:]) if isinstance(tree, AVLTree) else sorted(keys)
+        assert len(tree) == len(expected)
+        for i in range(0, len(expected), 37):
+            assert tree.select(i) == expected[i]
+            assert tree.rank(expected[i]) == i
+            assert tree.rank(expected[i] + 0.5) == i + 1
+        with pytest.raises(IndexError):
+            tree.select(len(expected))
+
+
+def test_sorted_insert():
+    bst = BinarySearchTree()
+    bst.insert(range(3000))
+    assert bst.exist(2999)
+    assert bst.in_order_traversal() == list(range(3000))
+
+
+def test_delete(data):
+    bst = BinarySearchTree()
+    bst.insert(data)
+    bst.delete(25)
+    bst.delete(4)
+    bst.delete(70)
+    expected = sorted(set(data) - {25, 4, 70})
+    assert bst.in_order_traversal() == expected
+    assert bst.pre_order_traversal()[0] == 31
+    assert len(bst) == len(expected)
+    with pytest.raises(ValueError, match="is not in tree"):
+        bst.delete(25)
+
+
+def test_pop_extremum():
+    keys = random.sample(range(1000), 300)
+    for tree in (BinarySearchTree(), AVLTree()):
+        tree.insert(keys)
+        assert [tree.pop_min() for _ in range(100)] == sorted(keys)[:100]
+        assert [tree.pop_max() for _ in range(100)] == sorted(keys)[-100:][::-1]
+        assert tree.in_order_traversal() == sorted(keys)[100:-100]
+        if isinstance(tree, AVLTree):
+            check_avl(tree.root)
+        while len(tree) > 0:
+            tree.pop_min()
+        with pytest.raises(ValueError, match="Tree is empty"):
+            tree.pop_max()
@@ -1,6 +1,13 @@
+import random
+
 import pytest
 
-from interview.data_structure.singly_linked_list import Node, SinglyLinkedList
+from interview.data_structure.singly_linked_list import (
+    Node,
+    PooledLinkedList,
+    SinglyLinkedList,
+    UnrolledLinkedList,
+)
 
 
 @pytest.fixture
@@ -126,3 +133,233 @@ def test_remove_node_at_wrong_position_in_linked_list(data):
         match=f"position is out of range. Linked list has {len(data)} elements",
     ):
         assert sll.remove(20)
+
+
+def check(sll):
+    nodes = list(sll)
+    assert len(sll) == len(nodes)
+    assert sll.tail is (nodes[-1] if nodes else None)
+
+
+def test_tail_and_size(data):
+    sll = SinglyLinkedList()
+    check(sll)
+    sll.create(data)
+    check(sll)
+    sll.insert("last", position=len(data))
+    assert sll.tail.data == "last"
+    sll.insert("middle", position=2)
+    sll.insert("first", position=0)
+    check(sll)
+    sll.remove(len(sll) - 1)
+    assert sll.tail.data == data[-1]
+    sll.remove(3)
+    sll.remove(0)
+    check(sll)
+    while len(sll) > 0:
+        sll.remove(0)
+    check(sll)
+    sll.insert("new", position=0)
+    check(sll)
+
+
+def test_extend(data):
+    sll = SinglyLinkedList()
+    sll.extend(iter(data))
+    sll.extend(data)
+    assert [n.data for n in sll] == data + data
+    check(sll)
+
+
+def test_remove_node_at_negative_position(data):
+    sll = SinglyLinkedList()
+    sll.create(data)
+    with pytest.raises(
+        ValueError,
+        match=f"position is out of range. Linked list has {len(data)} elements",
+    ):
+        sll.remove(-1)
+
+
+def check_unrolled(ull, expected):
+    assert [n.data for n in ull] == expected
+    assert len(ull) == len(expected)
+    blocks = list(ull.iter_blocks())
+    assert all(0 < len(b.data) <= ull.capacity for b in blocks)
+    assert ull.tail is (blocks[-1] if blocks else None)
+    if ull.index:
+        assert ull.blocks == blocks
+        assert ull.start.tolist() == [
+            sum(len(b.data) for b in blocks[:k]) for k in range(len(blocks))
+        ]
+
+
+def test_unrolled_linked_list(data):
+    ull = UnrolledLinkedList(capacity=2)
+    ull.create(data)
+    assert str(ull) == " -> ".join(map(str, data)) + " -> None"
+    assert ull.get(2) == 12.5
+    ull.insert("first", position=0)
+    ull.insert("middle", position=3)
+    ull.append("last")
+    ull.remove(1)
+    expected = ["first", 33, "middle", 12.5, "ABC", "last"]
+    check_unrolled(ull, expected)
+
+
+def test_unrolled_linked_list_errors(data):
+    ull = UnrolledLinkedList()
+    assert ull.index
+    ull.extend([])
+    assert len(ull.start) == 0
+    with pytest.raises(ValueError, match="Linked list is empty"):
+        ull.remove(0)
+    with pytest.raises(
+        ValueError, match="position is out of range. Linked list is empty"
+    ):
+        ull.insert("new", position=3)
+    ull.create(data)
+    with pytest.raises(
+        ValueError,
+        match=f"position is out of range. Linked list has {len(data)} elements",
+    ):
+        ull.remove(len(data))
+    with pytest.raises(ValueError, match="capacity must be"):
+        UnrolledLinkedList(capacity=1)
+
+
+@pytest.mark.parametrize("index", [False, True])
+@pytest.mark.parametrize("capacity", [2, 3, 16])
+def test_unrolled_linked_list_random(capacity, index):
+    rng = random.Random(0)
+    ull = UnrolledLinkedList(capacity, index)
+    expected = list(range(50))
+    ull.extend(range(50))
+    for step in range(2000):
+        if expected and rng.random() < 0.45:
+            position = rng.randrange(len(expected))
+            ull.remove(position)
+            expected.pop(position)
+        else:
+            position = rng.randint(0, len(expected))
+            ull.insert(step, position)
+            expected.insert(position, step)
+        if step % 100 == 0:
+            check_unrolled(ull, expected)
+            ull.extend([-1, -2])
+            expected.extend([-1, -2])
+    check_unrolled(ull, expected)
+    assert [ull.get(i) for i in range(len(expected))] == expected
+
+
+def test_unrolled_linked_list_iteration_yields_live_nodes():
+    ull = UnrolledLinkedList(capacity=2)
+    ull.extend(range(5))
+    for node in ull:
+        node.data *= 10
+    check_unrolled(ull, [0, 10, 20, 30, 40])
+
+    node, values = next(iter(ull)), []
+    while node is not None:
+        values.append(node.data)
+        node = node.next
+    assert values == [0, 10, 20, 30, 40]
+
+
+@pytest.mark.parametrize("index", [False, True])
+def test_unrolled_linked_list_blocks_scale_with_square_root(index):
+    rng = random.Random(0)
+    ull = UnrolledLinkedList(capacity=4, index=index)
+    expected = list(range(20000))
+    for i in expected:
+        ull.append(i)
+    assert ull.capacity**2 >= len(ull)
+    assert len(list(ull.iter_blocks())) <= ull.capacity
+    for step in range(2000):
+        position = rng.randint(0, len(expected))
+        ull.insert(-step, position)
+        expected.insert(position, -step)
+    assert ull.capacity**2 >= len(ull)
+    assert len(list(ull.iter_blocks())) <= 2 * ull.capacity
+    check_unrolled(ull, expected)
+
+
+def check_pooled(pll, expected):
+    assert [n.data for n in pll] == expected
+    assert len(pll) == len(expected)
+    assert str(pll) == " -> ".join(map(str, expected + [None]))
+    free, i = 0, pll.free
+    while i != -1:
+        free, i = free + 1, pll.next[i]
+    assert free + len(expected) == len(pll.next)
+
+
+def test_pooled_linked_list(data):
+    pll = PooledLinkedList()
+    pll.create(data)
+    check_pooled(pll, data)
+    pll.insert("first", position=0)
+    pll.insert("middle", position=3)
+    pll.insert("last", position=len(pll))
+    pll.remove(1)
+    pll.remove(len(pll) - 1)
+    check_pooled(pll, ["first", 33, "middle", 12.5, "ABC"])
+    assert pll.data[pll.tail] == "ABC"
+
+    # Slots of removed nodes are reused
+    pll.append("new")
+    pll.extend(["a", "b"])
+    assert len(pll.next) == 8
+    check_pooled(pll, ["first", 33, "middle", 12.5, "ABC", "new", "a", "b"])
+
+
+def test_pooled_linked_list_iteration_yields_live_nodes():
+    pll = PooledLinkedList("q")
+    pll.extend(range(5))
+    pll.remove(1)
+    for node in pll:
+        node.data *= 10
+    check_pooled(pll, [0, 20, 30, 40])
+
+    node, values = next(iter(pll)), []
+    while node is not None:
+        values.append(node.data)
+        node = node.next
+    assert values == [0, 20, 30, 40]
+
+
+def test_pooled_linked_list_errors(data):
+    pll = PooledLinkedList()
+    with pytest.raises(ValueError, match="Linked list is empty"):
+        pll.remove(0)
+    with pytest.raises(
+        ValueError, match="position is out of range. Linked list is empty"
+    ):
+        pll.insert("new", position=3)
+    pll.create(data)
+    with pytest.raises(
+        ValueError,
+        match=f"position is out of range. Linked list has {len(data)} elements",
+    ):
+        pll.insert("new", position=10)
+
+
+def test_pooled_linked_list_random():
+    rng = random.Random(0)
+    pll = PooledLinkedList("q")
+    expected = list(range(20))
+    pll.extend(range(20))
+    for step in range(1000):
+        if expected and rng.random() < 0.5:
+            position = rng.randrange(len(expected))
+            pll.remove(position)
+            expected.pop(position)
+        else:
+            position = rng.randint(0, len(expected))
+            pll.insert(step, position)
+            expected.insert(position, step)
+    check_pooled(pll, expected)
+    while expected:
+        pll.remove(0)
+        expected.pop(0)
+    assert pll.head == pll.tail == -1